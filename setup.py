@@ -63,6 +63,10 @@ setup(
         "pyperclip>=1.8.0",
         "curl_cffi>=0.5.0"  # Adding the missing dependency
     ],
+    extras_require={
+        # Filesystem notifications for the background daemon
+        "daemon": ["watchdog>=2.0"],
+    },
     entry_points={
         'console_scripts': [
             'claude-sync=claude_sync.cli.main:main',
@@ -1,4 +1,10 @@
-from claude_sync.core.syncer import FileSyncer
-
 __version__ = "0.1.0"
 __all__ = ["FileSyncer"]
+
+
+def __getattr__(name):
+    # Imported on first use so the daemon client never loads the HTTP stack
+    if name == "FileSyncer":
+        from claude_sync.core.syncer import FileSyncer
+        return FileSyncer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
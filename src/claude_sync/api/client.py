@@ -1,7 +1,15 @@
 import os
 import re
-from typing import List, Dict
+import threading
+from typing import Callable, Dict, Iterator, List, Optional
 from curl_cffi import requests as curl_requests
+from claude_sync.api.remote_index import RemoteDoc
+from claude_sync.utils.file_utils import read_text
+from claude_sync.utils.json_stream import iter_json_array
+from claude_sync.utils.rate_limiter import RateLimiter
+
+# Bytes read from the socket at a time while streaming the docs listing
+LISTING_CHUNK_SIZE = 64 * 1024
 
 class APIClient:
     def __init__(self, config: dict):
@@ -31,6 +39,21 @@ class APIClient:
             'impersonate': "chrome110",
             'verify': False  # Disable SSL verification
         }
+        # Sessions keep connections alive between calls; curl handles can't be
+        # shared across threads, so each thread gets its own
+        self._local = threading.local()
+        # Shared with other claude-sync processes on this host; None when unlimited
+        self.rate_limiter = RateLimiter.from_config(config)
+        # Called with the payload size of every request, e.g. by a progress meter
+        self.on_request: Optional[Callable[[int], None]] = None
+
+    @property
+    def session(self) -> curl_requests.Session:
+        """HTTP session of the calling thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = curl_requests.Session()
+        return session
 
     def _validate_ids(self):
         """Validate organization and project IDs"""
@@ -47,6 +70,13 @@ class APIClient:
         if not re.match(uuid_pattern, self.config['project_id'].lower()):
             raise ValueError(f"Invalid project ID format: {self.config['project_id']}")
 
+    def _throttle(self, nbytes: int = 0):
+        """Wait until the shared rate limit allows a request carrying nbytes"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(nbytes)
+        if self.on_request:
+            self.on_request(nbytes)
+
     def _log_request(self, method: str, url: str, data: dict = None):
         """Log request details if debug is enabled"""
         if self.debug:
@@ -75,20 +105,22 @@ class APIClient:
 
     def upload_file(self, filepath: str, local_path: str = None) -> dict:
         """Upload a file to Claude"""
+        return self.upload_content(filepath, read_text(filepath))
+
+    def upload_content(self, file_name: str, content: str) -> dict:
+        """Upload text that was already read as a doc named file_name"""
         url = f"{self.config['base_url']}/api/organizations/{self.config['organization_id']}/projects/{self.config['project_id']}/docs"
         
-        with open(filepath, 'r') as f:
-            content = f.read()
-            
         data = {
-            "file_name": filepath,  # Use full filepath to preserve structure
+            "file_name": file_name,  # Use full filepath to preserve structure
             "content": content,
             "project_uuid": self.config['project_id']
         }
         
+        self._throttle(len(content.encode('utf-8')))
         self._log_request('POST', url, data)
         
-        response = curl_requests.post(
+        response = self.session.post(
             url, 
             json=data,
             **self.request_params
@@ -105,9 +137,10 @@ class APIClient:
             "docUuid": file_id
         }
         
+        self._throttle()
         self._log_request('DELETE', url, data)
         
-        response = curl_requests.delete(
+        response = self.session.delete(
             url,
             json=data,
             **self.request_params
@@ -115,16 +148,76 @@ class APIClient:
         
         self._handle_error(response, "file deletion")
 
-    def list_remote_files(self) -> List[dict]:
-        """List remote files including metadata."""
-        url = f"{self.config['base_url']}/api/organizations/{self.config['organization_id']}/projects/{self.config['project_id']}/docs"
+    def get_file(self, file_id: str) -> dict:
+        """Fetch a single doc, including its content"""
+        url = f"{self.config['base_url']}/api/organizations/{self.config['organization_id']}/projects/{self.config['project_id']}/docs/{file_id}"
+        
+        self._throttle()
+        self._log_request('GET', url)
+        
+        response = self.session.get(
+            url,
+            **self.request_params
+        )
         
+        self._handle_error(response, "file download")
+        return response.json()
+
+    def _iter_docs_page(self, url: str) -> Iterator[RemoteDoc]:
+        """Stream one listing response, keeping only the fields of each doc we use"""
+        self._throttle()
         self._log_request('GET', url)
         
-        response = curl_requests.get(
+        response = self.session.get(
             url, 
+            stream=True,
             **self.request_params
         )
         
-        self._handle_error(response, "listing files")
-        return response.json()
\ No newline at end of file
+        try:
+            self._handle_error(response, "listing files")
+            for doc in iter_json_array(response.iter_content(chunk_size=LISTING_CHUNK_SIZE)):
+                yield RemoteDoc.from_json(doc)
+        finally:
+            response.close()
+
+    def iter_remote_files(self) -> Iterator[RemoteDoc]:
+        """
+        Yield remote files as the listing is parsed.
+        If 'remote_page_size' is configured, the listing is fetched in pages
+        with limit/offset until a short page comes back. Servers that ignore
+        limit or offset are detected instead of being paged forever.
+        """
+        url = f"{self.config['base_url']}/api/organizations/{self.config['organization_id']}/projects/{self.config['project_id']}/docs"
+        page_size = self.config.get('remote_page_size')
+        
+        if not page_size:
+            yield from self._iter_docs_page(url)
+            return
+        
+        offset = 0
+        previous_first = None
+        while True:
+            count = 0
+            for doc in self._iter_docs_page(f"{url}?limit={page_size}&offset={offset}"):
+                if count == 0:
+                    # The same first doc again means the server ignores offset: paging
+                    # would never end and never get past the first page
+                    if doc.uuid == previous_first:
+                        raise ValueError("remote_page_size is not supported by this server (it ignores "
+                                         "offset); remove it from .sync_config.json")
+                    previous_first = doc.uuid
+                count += 1
+                yield doc
+            if count > page_size:
+                # The server ignores limit and sent the whole listing at once
+                print(f"Warning: remote_page_size is not supported by this server (it ignores limit); "
+                      f"remove it from .sync_config.json")
+                return
+            if count < page_size:
+                return
+            offset += count
+
+    def list_remote_files(self) -> List[RemoteDoc]:
+        """List remote files including metadata."""
+        return list(self.iter_remote_files())
\ No newline at end of file
@@ -0,0 +1,33 @@
+from typing import Optional
+
+
+class RemoteDoc:
+    """The fields of a remote doc that syncing needs, without its content"""
+
+    __slots__ = ('uuid', 'file_name', 'local_path', 'created_at', 'updated_at', 'content_hash')
+
+    def __init__(self, uuid: str, file_name: str, local_path: Optional[str] = None,
+                 created_at: Optional[str] = None, updated_at: Optional[str] = None,
+                 content_hash: Optional[str] = None):
+        self.uuid = uuid
+        self.file_name = file_name
+        # Try to get local path from metadata, fallback to filename
+        self.local_path = local_path or file_name
+        self.created_at = created_at
+        self.updated_at = updated_at or created_at
+        self.content_hash = content_hash
+
+    @classmethod
+    def from_json(cls, doc: dict) -> 'RemoteDoc':
+        """Build from one element of the /docs listing; API returns 'uuid' instead of 'id'"""
+        return cls(
+            uuid=doc['uuid'],
+            file_name=doc['file_name'],
+            local_path=(doc.get('metadata') or {}).get('local_path'),
+            created_at=doc.get('created_at'),
+            updated_at=doc.get('updated_at'),
+            content_hash=doc.get('content_hash')
+        )
+
+    def __repr__(self) -> str:
+        return f"RemoteDoc(uuid={self.uuid!r}, local_path={self.local_path!r}, updated_at={self.updated_at!r})"
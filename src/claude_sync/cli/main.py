@@ -1,7 +1,10 @@
 # Update to src/claude_sync/cli/main.py
 
 import argparse
-from claude_sync.core.syncer import FileSyncer
+import time
+from claude_sync.core.daemon import DaemonClient, SOCKET_PATH
+from claude_sync.core.file_state import SyncAction, SyncStateStore
+from claude_sync.core.stats import estimate_tokens
 from datetime import datetime
 import os
 
@@ -15,6 +18,190 @@ def format_time(time_str: str) -> str:
     except:
         return time_str
 
+def format_size(size: float) -> str:
+    """Format a byte count to be more readable"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+
+def print_status(status: SyncStateStore):
+    """Print the local file status table"""
+    # Count statistics
+    total_files = status.local_count
+    needs_sync = status.to_sync_count
+    up_to_date = total_files - needs_sync
+    to_delete = status.count(SyncAction.DELETE)
+    
+    # Print file statuses in a table format
+    print("\nLocal File Status:")
+    
+    # Headers with status first, then last sync time, then filename
+    print(f"{'Status':<15} {'Last Sync':<25} File")
+    print("-" * 80)  # Table separator
+    
+    # Local entries are already in path order
+    for info in status.local():
+        last_sync = format_time(info.last_sync or 'Never')
+        sync_state = "Needs sync" if info.needs_sync else "Up to date"
+        print(f"{sync_state:<15} {last_sync:<25} {info.path}")
+    
+    # Print files to be deleted if any
+    if to_delete:
+        print("\nRemote Files to Delete:")
+        for filepath in sorted(info.path for info in status.deletions()):
+            print(f"  {filepath}")
+    
+    # Print summary
+    print(f"\nSummary:")
+    print(f"Total files:  {total_files}")
+    print(f"Need sync:    {needs_sync}")
+    print(f"Up to date:   {up_to_date}")
+    if to_delete:
+        print(f"To delete:    {to_delete}")
+
+def confirm_sync(status: SyncStateStore, dry_run: bool) -> bool:
+    """Show what will be synced and ask before going ahead"""
+    to_sync = status.to_sync_count
+    to_delete = status.count(SyncAction.DELETE)
+    
+    # Show what will be synced
+    if to_sync:
+        print("\nFiles to sync:")
+        for info in status.select(SyncAction.UPLOAD, SyncAction.REPLACE):
+            action = "Upload new file" if info.action == SyncAction.UPLOAD else "Replace existing file"
+            print(f"  {info.path} - {action}")
+    
+    if to_delete:
+        print("\nRemote files to delete:")
+        for info in status.deletions():
+            print(f"  {info.path}")
+            
+    if not to_sync and not to_delete:
+        print("\nNo changes to sync.")
+        return False
+        
+    # For dry-run, stop here
+    if dry_run:
+        return False
+        
+    # For actual sync, ask for confirmation
+    print(f"\nSummary of changes:")
+    print(f"  Files to upload/update: {to_sync}")
+    print(f"  Remote files to delete: {to_delete}")
+    
+    response = input("\nDo you want to proceed with these changes? [y/N] ").lower().strip()
+    if response != 'y':
+        print("Sync cancelled.")
+        return False
+    return True
+
+def print_duplicates(groups: list, dedupe: str):
+    """Print duplicate groups, marking the file that would be uploaded"""
+    if not groups:
+        print("\nNo duplicate files found.")
+        return
+    
+    for kind, title in (('exact', 'Exact Duplicates'), ('near', 'Near Duplicates')):
+        kind_groups = [group for group in groups if group['kind'] == kind]
+        if not kind_groups:
+            continue
+        print(f"\n{title}:")
+        for group in kind_groups:
+            print()
+            for filepath in group['files']:
+                marker = 'keep' if filepath == group['keep'] else ''
+                print(f"  {marker:<6} {format_size(group['sizes'][filepath]):>10}  {filepath}")
+    
+    redundant = sum(len(group['files']) - 1 for group in groups)
+    redundant_bytes = sum(sum(group['sizes'].values()) - group['sizes'][group['keep']] for group in groups)
+    
+    # Print summary
+    print(f"\nSummary:")
+    print(f"Groups:          {len(groups)}")
+    print(f"Redundant files: {redundant} ({format_size(redundant_bytes)})")
+    if not dedupe:
+        print("\nSet \"dedupe\" to \"exact\" or \"near\" in .sync_config.json to upload only the kept file of each group.")
+
+def run_via_daemon(client: DaemonClient, args) -> bool:
+    """Serve --status/--sync/--dry-run from a running daemon; False if not applicable"""
+    if args.pull or not (args.status or args.sync or args.dry_run):
+        return False
+
+    try:
+        status = SyncStateStore.from_json(client.request('status')['status'])
+    except Exception as e:
+        # Most likely busy with another sync; don't run alongside it
+        print(f"Daemon: {e}")
+        return True
+    if not status:
+        return True
+
+    if args.status:
+        print_status(status)
+    elif confirm_sync(status, args.dry_run):
+        print("\nStarting sync...")
+        try:
+            reply = client.request('sync', fingerprint=status.fingerprint())
+        except Exception as e:
+            print(f"Sync not started: {e}")
+            return True
+        print(reply['output'], end='')
+    return True
+
+def start_daemon(debug: bool):
+    """Start the background daemon for the project in the current directory"""
+    from claude_sync.core.daemon import SyncDaemon
+    from claude_sync.core.syncer import FileSyncer
+
+    if DaemonClient.connect() is not None:
+        print("Daemon is already running for this project.")
+        return
+
+    # Load config here, where prompts can still reach the user
+    syncer = FileSyncer(debug=debug)
+    if syncer.first_run:
+        syncer.get_sync_status()
+        return
+
+    pid = SyncDaemon(syncer).run_in_background()
+    # Wait for the socket so the next command can use it right away
+    for _ in range(50):
+        if DaemonClient.connect() is not None:
+            break
+        time.sleep(0.1)
+    print(f"Started daemon (pid {pid}) listening on {SOCKET_PATH}")
+
+def print_stats(stats):
+    """Print the project analysis produced by FileSyncer.get_project_stats"""
+    def print_breakdown(title, breakdown):
+        print(f"\n{title}:")
+        print(f"{'':<20} {'Files':>8} {'Size':>10} {'Tokens':>10}")
+        print("-" * 51)
+        for key, (count, size) in sorted(breakdown.items(), key=lambda x: x[1][1], reverse=True):
+            print(f"{key:<20} {count:>8} {format_size(size):>10} {estimate_tokens(size):>10}")
+
+    print_breakdown("By extension", stats.by_extension)
+    print_breakdown("By top-level directory", stats.by_directory)
+
+    if stats.largest_files:
+        print("\nLargest files:")
+        for filepath, size in stats.largest_files:
+            print(f"  {format_size(size):>10}  {filepath}")
+
+    if stats.ignored_dirs:
+        print("\nHeaviest ignored directories (not scanned during sync):")
+        for dirpath, count, size in stats.ignored_dirs:
+            print(f"  {format_size(size):>10}  {count:>8} files  {dirpath}")
+
+    print(f"\nSummary:")
+    print(f"Files to sync:      {stats.total_files}")
+    print(f"Total size:         {format_size(stats.total_bytes)}")
+    print(f"Estimated tokens:   {stats.estimated_tokens}")
+    print(f"Upload requests:    {stats.projected_requests}")
+    print(f"Projected time:     {stats.projected_seconds:.0f}s for a full sync")
+
 def main():
     parser = argparse.ArgumentParser(description='File sync utility for Claude API')
     parser.add_argument('--status', action='store_true', help='Show sync status of all files')
@@ -23,12 +210,45 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Show what would be synced without actually syncing')
     parser.add_argument('--debug', action='store_true', help='Show debug information')
     parser.add_argument('--show-ignores', action='store_true', help='Show loaded ignore patterns')
+    parser.add_argument('--stats', action='store_true', help='Show sizes, token estimates and ignored directories')
+    parser.add_argument('--daemon', action='store_true', help='Start a background daemon that answers --status and --sync instantly')
+    parser.add_argument('--stop-daemon', action='store_true', help='Stop the background daemon of this project')
+    parser.add_argument('--no-daemon', action='store_true', help='Run directly even if a daemon is running')
+    parser.add_argument('--pull', action='store_true', help='Download remote files to their local paths')
+    parser.add_argument('--force', action='store_true', help='With --pull, overwrite files changed on both sides')
+    parser.add_argument('--duplicates', action='store_true', help='Show groups of identical and nearly identical files')
+    parser.add_argument('--scrub', action='store_true', help='Check a sample of synced files against the remote and queue drifted ones for --sync')
+    parser.add_argument('--scrub-requests', type=int, help='With --scrub, fetch at most this many remote docs')
+    parser.add_argument('--scrub-seconds', type=float, help='With --scrub, stop after this many seconds')
 
     
     args = parser.parse_args()
 
+    if args.daemon:
+        start_daemon(args.debug)
+        return
+
+    # Talk to a running daemon before paying for config, scan and listing
+    client = None if args.no_daemon or args.debug else DaemonClient.connect()
+    if args.stop_daemon:
+        if client is None:
+            print("No daemon is running for this project.")
+        else:
+            client.request('stop')
+            print("Daemon stopped.")
+        return
+    if client is not None and run_via_daemon(client, args):
+        return
+
+    # Deferred so the daemon client path never imports the HTTP stack
+    from claude_sync.core.syncer import FileSyncer
+
     if args.show_ignores:
         syncer = FileSyncer()
+        # Scanning loads the nested .syncignore files along the way, which a
+        # scan served from the cache would skip
+        syncer.scanner.cache = None
+        syncer.get_local_files()
         patterns = syncer.ignore_parser.debug_patterns()
         print("\nLoaded ignore patterns:")
         for pattern in patterns:
@@ -38,43 +258,47 @@ def main():
     syncer = FileSyncer(debug=args.debug)
     
     if args.status:
-        sync_status, delete_status = syncer.get_sync_status()
+        status = syncer.get_sync_status()
         
         # If first run, just exit since the summary was already shown
-        if syncer.first_run or not sync_status:
+        if syncer.first_run or not status:
             return
         
-        # Count statistics
-        total_files = len(sync_status)
-        needs_sync = sum(1 for info in sync_status.values() if info['needs_sync'])
-        up_to_date = total_files - needs_sync
-        
-        # Print file statuses in a table format
-        print("\nLocal File Status:")
-        
-        # Headers with status first, then last sync time, then filename
-        print(f"{'Status':<15} {'Last Sync':<25} File")
-        print("-" * 80)  # Table separator
-        
-        for filepath, info in sorted(sync_status.items()):
-            last_sync = format_time(info['last_sync'])
-            sync_state = "Needs sync" if info['needs_sync'] else "Up to date"
-            print(f"{sync_state:<15} {last_sync:<25} {filepath}")
-        
-        # Print files to be deleted if any
-        if delete_status:
-            print("\nRemote Files to Delete:")
-            for filepath in sorted(delete_status.keys()):
-                print(f"  {filepath}")
-        
-        # Print summary
-        print(f"\nSummary:")
-        print(f"Total files:  {total_files}")
-        print(f"Need sync:    {needs_sync}")
-        print(f"Up to date:   {up_to_date}")
-        if delete_status:
-            print(f"To delete:    {len(delete_status)}")
+        print_status(status)
     
+    elif args.pull:
+        # If first run, just handle the first-run scenario in get_sync_status
+        if syncer.first_run:
+            syncer.get_sync_status()
+            return
+
+        syncer.pull_files(dry_run=args.dry_run, force=args.force)
+
+    elif args.duplicates:
+        # If first run, just handle the first-run scenario in get_sync_status
+        if syncer.first_run:
+            syncer.get_sync_status()
+            return
+
+        groups = syncer.get_duplicate_groups(near=syncer.dedupe != 'exact')
+        print_duplicates(groups, syncer.dedupe)
+
+    elif args.scrub:
+        # If first run, just handle the first-run scenario in get_sync_status
+        if syncer.first_run:
+            syncer.get_sync_status()
+            return
+
+        syncer.scrub(max_requests=args.scrub_requests, max_seconds=args.scrub_seconds)
+
+    elif args.stats:
+        # If first run, just handle the first-run scenario in get_sync_status
+        if syncer.first_run:
+            syncer.get_sync_status()
+            return
+
+        print_stats(syncer.get_project_stats())
+
     elif args.list_remote:
         # If first run, just handle the first-run scenario in get_sync_status
         if syncer.first_run:
@@ -93,56 +317,27 @@ def main():
         print("-" * 65)
         
         # Sort files by name for consistent display
-        for file in sorted(remote_files, key=lambda x: x['file_name']):
-            created_at = format_time(file['created_at'])
-            print(f"{created_at:<25} {file['file_name']}")
+        for file in sorted(remote_files, key=lambda x: x.file_name):
+            created_at = format_time(file.created_at or '')
+            print(f"{created_at:<25} {file.file_name}")
             
         # Print summary
         print(f"\nTotal files: {len(remote_files)}")
     
     elif args.sync or args.dry_run:
         # Get sync status first
-        sync_status, delete_status = syncer.get_sync_status()
+        status = syncer.get_sync_status()
         
         # If first run, just exit since the summary was already shown
-        if syncer.first_run or not sync_status:
+        if syncer.first_run or not status:
             return
             
-        files_to_sync = {f: s for f, s in sync_status.items() if s['needs_sync']}
-        
-        # Show what will be synced
-        if files_to_sync:
-            print("\nFiles to sync:")
-            for filepath, info in files_to_sync.items():
-                action = "Upload new file" if info['action'] == 'upload' else "Replace existing file"
-                print(f"  {filepath} - {action}")
-        
-        if delete_status:
-            print("\nRemote files to delete:")
-            for filepath in delete_status:
-                print(f"  {filepath}")
-                
-        if not files_to_sync and not delete_status:
-            print("\nNo changes to sync.")
-            return
-            
-        # For dry-run, stop here
-        if args.dry_run:
-            return
-            
-        # For actual sync, ask for confirmation
-        print(f"\nSummary of changes:")
-        print(f"  Files to upload/update: {len(files_to_sync)}")
-        print(f"  Remote files to delete: {len(delete_status)}")
-        
-        response = input("\nDo you want to proceed with these changes? [y/N] ").lower().strip()
-        if response != 'y':
-            print("Sync cancelled.")
+        if not confirm_sync(status, args.dry_run):
             return
             
-        # Proceed with sync
+        # Proceed with sync, reusing the status that was just confirmed
         print("\nStarting sync...")
-        syncer.sync_files(dry_run=False)
+        syncer.sync_files(dry_run=False, status=status)
     
     else:
         parser.print_help()
@@ -0,0 +1,182 @@
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+from claude_sync.api.remote_index import RemoteDoc
+from claude_sync.utils.file_utils import hash_content
+
+DEFAULT_CHUNK_SIZE = 32 * 1024
+
+# Chunk docs are named "<path>.chunk-<hash prefix>", so the listing alone tells
+# which chunks already exist wherever they now fall in the file. Their order is
+# kept in an index doc, "<path>.chunk-index", listing one hash per line.
+CHUNK_INDEX = 'index'
+_CHUNK_NAME = re.compile(r'^(?P<path>.+)\.chunk-(?P<hash>[0-9a-f]{12}|index)$')
+
+
+def chunk_hash(content: str) -> str:
+    return hash_content(content)[:12]
+
+
+def chunk_file_name(filepath: str, digest: str) -> str:
+    return f"{filepath}.chunk-{digest}"
+
+
+def chunk_index_name(filepath: str) -> str:
+    return chunk_file_name(filepath, CHUNK_INDEX)
+
+
+def parse_chunk_name(file_name: str) -> Optional[Tuple[str, str]]:
+    """Return (path, hash) for a chunk doc name, (path, CHUNK_INDEX) for an index, None for a whole file"""
+    match = _CHUNK_NAME.match(file_name)
+    if not match:
+        return None
+    return match.group('path'), match.group('hash')
+
+
+def assemble_chunks(docs: Iterable[dict]) -> Optional[str]:
+    """
+    Rebuild a file from its fetched index and chunk docs ({'file_name', 'content'}),
+    None if the index is missing or names a chunk that isn't there
+    """
+    order = None
+    contents: Dict[str, str] = {}
+    for doc in docs:
+        parsed = parse_chunk_name(doc.get('file_name', ''))
+        if parsed is None:
+            continue
+        if parsed[1] == CHUNK_INDEX:
+            order = doc['content'].split()
+        else:
+            contents[parsed[1]] = doc['content']
+    if order is None or any(digest not in contents for digest in order):
+        return None
+    return ''.join(contents[digest] for digest in order)
+
+
+def chunk_identity(uuids: Iterable[str]) -> str:
+    """Identity of a file stored in the given docs, independent of their order"""
+    return ','.join(sorted(uuids))
+
+
+class ContentChunker:
+    """
+    Splits text into content-defined chunks.
+
+    Boundaries fall between lines where a hash rolling over the last 32 lines
+    hits a target, with a probability proportional to line length so chunks
+    average avg_size characters. An edit only moves the boundaries near it, so the
+    chunks of the rest of the file keep their hashes.
+    """
+
+    def __init__(self, avg_size: int = DEFAULT_CHUNK_SIZE):
+        self.avg_size = avg_size
+        self.min_size = avg_size // 4
+        self.max_size = avg_size * 4
+
+    def split(self, content: str) -> List[str]:
+        chunks = []
+        current: List[str] = []
+        size = 0
+        rolling = 0
+        # Hash values below this, per character of the line, end a chunk
+        threshold = (1 << 32) // self.avg_size
+
+        for line in content.splitlines(keepends=True):
+            # Lines longer than a whole chunk (minified files) are cut at fixed sizes
+            while len(line) > self.max_size:
+                if current:
+                    chunks.append(''.join(current))
+                    current, size = [], 0
+                chunks.append(line[:self.max_size])
+                line = line[self.max_size:]
+
+            current.append(line)
+            size += len(line)
+            rolling = ((rolling << 1) + zlib.crc32(line.encode('utf-8'))) & 0xFFFFFFFF
+
+            if size >= self.max_size or (size >= self.min_size and rolling < threshold * len(line)):
+                chunks.append(''.join(current))
+                current, size = [], 0
+
+        if current or not chunks:
+            chunks.append(''.join(current))
+        return chunks
+
+
+class RemoteFile:
+    """Everything stored remotely for one local path: a whole doc and/or an index and chunk docs"""
+
+    __slots__ = ('doc', 'index', 'chunks', 'stale')
+
+    def __init__(self):
+        self.doc: Optional[RemoteDoc] = None
+        self.index: Optional[RemoteDoc] = None
+        # {hash: doc}; a chunk that occurs several times in the file is stored once
+        self.chunks: Dict[str, RemoteDoc] = {}
+        # Older copies of the same doc, left behind when deleting a replaced doc failed
+        # or a push was interrupted; deleted on the next push
+        self.stale: List[RemoteDoc] = []
+
+    def _keep_newest(self, current: Optional[RemoteDoc], doc: RemoteDoc) -> RemoteDoc:
+        """Return the newer of two copies of the same doc, moving the other one to stale"""
+        if current is None:
+            return doc
+        if (doc.updated_at or '') > (current.updated_at or ''):
+            current, doc = doc, current
+        self.stale.append(doc)
+        return current
+
+    @property
+    def chunked(self) -> bool:
+        return bool(self.index or self.chunks)
+
+    @property
+    def incomplete(self) -> bool:
+        """
+        Whether a push stopped before uploading the index of its chunks: chunks
+        without an index, or chunks newer than the index, which still describes
+        the previous version
+        """
+        if not self.chunked:
+            return False
+        if self.index is None:
+            return True
+        index_time = self.index.updated_at or ''
+        return any((doc.updated_at or '') > index_time for doc in self.chunks.values())
+
+    @property
+    def docs(self) -> List[RemoteDoc]:
+        """All current docs, the whole doc and index first"""
+        return ([self.doc] if self.doc else []) + ([self.index] if self.index else []) + \
+            [self.chunks[digest] for digest in sorted(self.chunks)]
+
+    @property
+    def updated_at(self) -> Optional[str]:
+        return max((doc.updated_at for doc in self.docs if doc.updated_at), default=None)
+
+    @property
+    def identity(self) -> str:
+        """Changes whenever any doc behind the file is replaced"""
+        return chunk_identity(doc.uuid for doc in self.docs)
+
+    def chunk_info(self) -> List[dict]:
+        return [{'hash': digest, 'uuid': doc.uuid} for digest, doc in sorted(self.chunks.items())]
+
+
+def group_remote_files(remote_files: Iterable[RemoteDoc]) -> Dict[str, RemoteFile]:
+    """Index remote docs by the local path they belong to, folding chunks together"""
+    grouped: Dict[str, RemoteFile] = {}
+    for doc in remote_files:
+        parsed = parse_chunk_name(doc.local_path)
+        if parsed is None:
+            remote = grouped.setdefault(doc.local_path, RemoteFile())
+            remote.doc = remote._keep_newest(remote.doc, doc)
+            continue
+
+        filepath, digest = parsed
+        remote = grouped.setdefault(filepath, RemoteFile())
+        if digest == CHUNK_INDEX:
+            remote.index = remote._keep_newest(remote.index, doc)
+        else:
+            remote.chunks[digest] = remote._keep_newest(remote.chunks.get(digest), doc)
+    return grouped
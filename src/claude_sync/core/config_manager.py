@@ -37,6 +37,20 @@ class ConfigManager:
                 print(f"Warning: Error reading global config: {e}")
         return None, None
 
+    def _load_global_rate_limit(self) -> Dict:
+        """
+        Load the optional 'rate_limit' section of the global config, shared by
+        every project on this machine, e.g.
+        {"requests_per_second": 2, "bytes_per_second": 1048576, "burst_seconds": 1}
+        """
+        if os.path.exists(self.global_config_path):
+            try:
+                with open(self.global_config_path, 'r') as f:
+                    return json.load(f).get('rate_limit') or {}
+            except Exception as e:
+                print(f"Warning: Error reading global config: {e}")
+        return {}
+
     def _ensure_global_config(self) -> Tuple[str, str]:
         """
         Ensure global config exists with session key and default org ID.
@@ -148,8 +162,9 @@ class ConfigManager:
         else:
             config = self._create_initial_config(default_org_id)
         
-        # Add session key from global config to the running config (but don't save it)
+        # Add session key and rate limits from global config to the running config (but don't save them)
         config['session_key'] = session_key
+        config['rate_limit'] = self._load_global_rate_limit()
             
         return config
 
@@ -231,10 +246,11 @@ __pycache__/
 
     def _save_config(self, config: Dict):
         """Save project config to file"""
-        # Create a copy of the config without the session key
+        # Create a copy of the config without the settings that belong to the global config
         project_config = config.copy()
-        if 'session_key' in project_config:
-            del project_config['session_key']
+        for key in ('session_key', 'rate_limit'):
+            if key in project_config:
+                del project_config[key]
             
         with open(self.config_path, 'w') as f:
             json.dump(project_config, f, indent=2)
\ No newline at end of file
@@ -0,0 +1,272 @@
+import os
+import io
+import json
+import time
+import socket
+import threading
+import contextlib
+from typing import Optional
+
+# Relative to the project directory, which also keeps it clear of the
+# ~108 byte limit on socket paths
+SOCKET_PATH = '.claude-sync.sock'
+DEFAULT_IDLE_TIMEOUT = 600
+DEFAULT_REMOTE_TTL = 30
+# Seconds a client may take to send its request line
+REQUEST_TIMEOUT = 5.0
+
+
+class DaemonClient:
+    """Thin client that forwards CLI commands to a running daemon"""
+
+    def __init__(self, path: str = SOCKET_PATH):
+        self.path = path
+
+    @classmethod
+    def connect(cls, path: str = SOCKET_PATH) -> Optional['DaemonClient']:
+        """Return a client if a daemon is listening for this project, else None"""
+        if not hasattr(socket, 'AF_UNIX') or not os.path.exists(path):
+            return None
+        client = cls(path)
+        try:
+            client.request('ping', timeout=1.0)
+        except (OSError, ValueError):
+            return None
+        return client
+
+    def request(self, command: str, timeout: Optional[float] = None, **params) -> dict:
+        """Send one command, with optional parameters, and wait for its reply"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(self.path)
+            sock.sendall(json.dumps({'command': command, **params}).encode() + b'\n')
+            with sock.makefile('rb') as reader:
+                reply = json.loads(reader.readline())
+
+        if not reply.get('ok'):
+            raise Exception(reply.get('error', 'Daemon request failed'))
+        return reply
+
+
+class _ChangeHandler:
+    """Collects paths reported by watchdog until the next request"""
+
+    def __init__(self, daemon: 'SyncDaemon'):
+        self.daemon = daemon
+
+    def dispatch(self, event):
+        paths = [event.src_path, getattr(event, 'dest_path', None)]
+        with self.daemon.lock:
+            if event.is_directory and event.event_type != 'modified':
+                # A directory appeared, vanished or moved: the cheap way out is a rescan
+                self.daemon.needs_rescan = True
+            for path in paths:
+                if path:
+                    self.daemon.dirty.add(os.path.relpath(path))
+
+
+class SyncDaemon:
+    """
+    Per-project background process that keeps a FileSyncer warm.
+
+    It holds the HTTP session, the compiled ignore rules, the scan (kept fresh
+    through filesystem notifications when watchdog is installed) and a cached
+    remote listing, and serves --status and --sync over a Unix socket. It exits
+    after idle_timeout seconds without a request.
+    """
+
+    def __init__(self, syncer, path: str = SOCKET_PATH):
+        self.syncer = syncer
+        self.path = path
+        self.idle_timeout = syncer.config.get('daemon_idle_timeout', DEFAULT_IDLE_TIMEOUT)
+        self.remote_ttl = syncer.config.get('daemon_remote_ttl', DEFAULT_REMOTE_TTL)
+        self.lock = threading.Lock()
+        self.local_files = None
+        self.needs_rescan = True
+        self.dirty = set()
+        self.remote_files = None
+        self.remote_fetched_at = 0.0
+        self.observer = None
+        # Held while a status or sync runs; they share the syncer, so one at a time
+        self.busy = threading.Lock()
+
+    def start_watching(self):
+        """Subscribe to filesystem notifications if watchdog is available"""
+        # Filesystem notifications are optional; without watchdog the daemon rescans
+        # the tree on every request, which still saves startup, config and listing.
+        # Imported here so CLI calls that only talk to the daemon don't load it.
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            return
+        self.observer = Observer()
+        self.observer.schedule(_ChangeHandler(self), '.', recursive=True)
+        self.observer.daemon = True
+        self.observer.start()
+
+    def _refresh_local(self):
+        """Bring the cached scan up to date with the changes seen since the last request"""
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+            rescan = self.needs_rescan or self.observer is None or self.local_files is None
+            self.needs_rescan = False
+
+        if not rescan and any(os.path.basename(path) == self.syncer.ignore_parser.ignore_name
+                              for path in dirty):
+            rescan = True
+
+        if rescan:
+            self.syncer.ignore_parser.reload()
+            self.local_files = self.syncer.get_local_files()
+            self.local_files.pop(self.path, None)
+            return
+
+        for filepath in dirty:
+            if filepath == self.path:
+                continue
+            if os.path.isfile(filepath) and not self.syncer.ignore_parser.should_ignore(filepath):
+                try:
+                    self.local_files[filepath] = os.path.getmtime(filepath)
+                    continue
+                except OSError:
+                    pass
+            self.local_files.pop(filepath, None)
+
+    def _refresh_remote(self):
+        if self.remote_files is None or time.monotonic() - self.remote_fetched_at > self.remote_ttl:
+            self.remote_files = self.syncer.api_client.list_remote_files()
+            self.remote_fetched_at = time.monotonic()
+
+    def _status(self):
+        self._refresh_local()
+        self._refresh_remote()
+        # A --scrub or --pull run directly may have updated the sync state
+        self.syncer.manifest.reload()
+        # Sorted keys keep the table in the same order as a direct run
+        return self.syncer.get_sync_status(local_files=dict(sorted(self.local_files.items())),
+                                           remote_files=self.remote_files)
+
+    def handle(self, command: str, params: Optional[dict] = None) -> dict:
+        if command == 'ping':
+            return {'ok': True, 'pid': os.getpid(), 'busy': self.busy.locked()}
+
+        if command == 'status':
+            return {'ok': True, 'status': self._status().to_json()}
+
+        if command == 'sync':
+            status = self._status()
+            # Only run the changes the user confirmed; anything new needs a fresh look
+            if (params or {}).get('fingerprint') != status.fingerprint():
+                return {'ok': False, 'error': "The project changed since the status was shown. "
+                                              "Run the command again to review the new changes."}
+            output = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(output):
+                    self.syncer.sync_files(status=status)
+            finally:
+                # The remote changed under us either way
+                self.remote_files = None
+            return {'ok': True, 'output': output.getvalue()}
+
+        if command == 'stop':
+            return {'ok': True}
+
+        return {'ok': False, 'error': f"Unknown command: {command}"}
+
+    def _serve_command(self, conn: socket.socket, command: str, request: dict):
+        """Run a status or sync on its own thread, then release the daemon for the next one"""
+        try:
+            try:
+                reply = self.handle(command, request)
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            self._reply(conn, reply)
+        finally:
+            self.busy.release()
+            conn.close()
+
+    @staticmethod
+    def _reply(conn: socket.socket, reply: dict):
+        try:
+            conn.sendall(json.dumps(reply).encode() + b'\n')
+        except OSError:
+            pass
+
+    def serve_forever(self):
+        """
+        Accept commands until stopped or idle for too long. A status or sync runs
+        on a worker thread, so pings are still answered during a long sync, and a
+        second status or sync meanwhile is told the daemon is busy.
+        """
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        server.listen()
+        server.settimeout(self.idle_timeout)
+        self.start_watching()
+        worker = None
+
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    if self.busy.locked():
+                        # A long sync is not idleness
+                        continue
+                    break
+
+                try:
+                    conn.settimeout(REQUEST_TIMEOUT)
+                    with conn.makefile('rb') as reader:
+                        request = json.loads(reader.readline())
+                    command = request.get('command')
+                    conn.settimeout(None)
+                except Exception as e:
+                    self._reply(conn, {'ok': False, 'error': str(e)})
+                    conn.close()
+                    continue
+
+                if command in ('status', 'sync'):
+                    if not self.busy.acquire(blocking=False):
+                        # Running it directly instead could sync the same project twice at once
+                        self._reply(conn, {'ok': False, 'error': "The daemon is busy with another sync. "
+                                                                  "Try again when it finishes."})
+                        conn.close()
+                        continue
+                    worker = threading.Thread(target=self._serve_command, args=(conn, command, request),
+                                              daemon=True)
+                    worker.start()
+                    continue
+
+                with conn:
+                    self._reply(conn, self.handle(command, request))
+                if command == 'stop':
+                    break
+        finally:
+            server.close()
+            # Let a sync in progress finish before the process goes away
+            if worker is not None:
+                worker.join()
+            if self.observer is not None:
+                self.observer.stop()
+            with contextlib.suppress(OSError):
+                os.unlink(self.path)
+
+    def run_in_background(self) -> int:
+        """Fork a detached daemon process and return its pid to the parent"""
+        # A socket left behind by a crashed daemon would make bind() fail
+        if os.path.exists(self.path) and DaemonClient.connect(self.path) is None:
+            os.unlink(self.path)
+
+        pid = os.fork()
+        if pid:
+            return pid
+
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            self.serve_forever()
+        finally:
+            os._exit(0)
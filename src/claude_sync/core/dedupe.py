@@ -0,0 +1,209 @@
+import os
+import re
+import json
+import zlib
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+from claude_sync.utils.file_utils import hash_content, read_text, write_text_atomic
+
+# Signature shape: NUM_PERM minimums, compared in BANDS bands of NUM_PERM // BANDS rows.
+# With 16 bands of 4 rows, a pair with 0.75 similarity shares a bucket 99.8% of the time.
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 5
+DEFAULT_SIMILARITY = 0.9
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5eed)
+# Fixed seed, so signatures stay comparable across runs and with the cache
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERM)]
+_TOKEN = re.compile(r'\w+')
+
+
+def minhash(content: str) -> List[int]:
+    """MinHash signature of the word shingles of content, empty if it has no words"""
+    tokens = _TOKEN.findall(content)
+    if not tokens:
+        return []
+    shingles = {zlib.crc32(' '.join(tokens[i:i + SHINGLE_SIZE]).encode('utf-8'))
+                for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))}
+    return [min((a * x + b) % _MERSENNE_PRIME for x in shingles) for a, b in _PERMUTATIONS]
+
+
+def similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+class FingerprintCache:
+    """
+    Content hash and MinHash signature of each file, kept in .sync_dedupe_cache.json.
+    Hashes are reused while a file's mtime and size are unchanged, and signatures
+    are stored per content hash, so only new content is ever read and shingled.
+    Signatures are only computed for callers that ask for them.
+    """
+
+    def __init__(self, path: str = ".sync_dedupe_cache.json"):
+        self.path = path
+        self.files: Dict[str, list] = {}
+        self.signatures: Dict[str, List[int]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (ValueError, OSError) as e:
+            print(f"Warning: Ignoring unreadable dedupe cache {self.path}: {e}")
+            return
+        # Signatures made with other parameters can't be compared
+        if data.get('num_perm') == NUM_PERM and data.get('shingle_size') == SHINGLE_SIZE:
+            self.files = data.get('files', {})
+            self.signatures = data.get('signatures', {})
+
+    def fingerprint(self, filepath: str, signature: bool = True) -> Optional[Tuple[str, Optional[List[int]], int]]:
+        """
+        Return (content hash, signature, size) of a file, None if it can't be read as text.
+        Without signature, only the hash is computed and the signature is None.
+        """
+        try:
+            st = os.stat(filepath)
+            cached = self.files.get(filepath)
+            if cached and cached[0] == st.st_mtime and cached[1] == st.st_size and \
+                    (not signature or cached[2] in self.signatures):
+                return cached[2], self.signatures[cached[2]] if signature else None, st.st_size
+            content = read_text(filepath)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        digest = hash_content(content)
+        if signature and digest not in self.signatures:
+            self.signatures[digest] = minhash(content)
+        self.files[filepath] = [st.st_mtime, st.st_size, digest]
+        return digest, self.signatures[digest] if signature else None, st.st_size
+
+    def save(self, keep: Iterable[str]):
+        """Write the cache, dropping files not in keep and signatures no file uses"""
+        keep = set(keep)
+        self.files = {path: entry for path, entry in self.files.items() if path in keep}
+        used = {entry[2] for entry in self.files.values()}
+        self.signatures = {digest: sig for digest, sig in self.signatures.items() if digest in used}
+        write_text_atomic(self.path, json.dumps({
+            'num_perm': NUM_PERM,
+            'shingle_size': SHINGLE_SIZE,
+            'files': self.files,
+            'signatures': self.signatures
+        }))
+
+
+class DuplicateDetector:
+    """
+    Groups files with identical content (same hash) and, optionally, nearly
+    identical content (MinHash similarity at least threshold, with candidates
+    found through locality-sensitive hashing rather than comparing every pair).
+    Every file of a near group is at least threshold similar to the group's
+    representative, not just to some other member.
+
+    Each group is {'kind': 'exact' or 'near', 'keep': representative, 'files': [...],
+    'sizes': {path: bytes}}. keep picks the representative: 'shortest' path
+    (vendored copies tend to be nested deeper), 'first' in path order, or 'newest'.
+    """
+
+    KEEP_POLICIES = ('shortest', 'first', 'newest')
+
+    def __init__(self, cache: FingerprintCache, threshold: float = DEFAULT_SIMILARITY,
+                 near: bool = True, keep: str = 'shortest'):
+        if keep not in self.KEEP_POLICIES:
+            raise ValueError(f"Unknown dedupe_keep policy '{keep}', expected one of {', '.join(self.KEEP_POLICIES)}")
+        self.cache = cache
+        self.threshold = threshold
+        self.near = near
+        self.keep = keep
+
+    def _representative(self, files: List[str], mtimes: Dict[str, float]) -> str:
+        if self.keep == 'newest':
+            return max(files, key=lambda path: (mtimes.get(path, 0), path))
+        if self.keep == 'first':
+            return min(files)
+        return min(files, key=lambda path: (path.count(os.sep), len(path), path))
+
+    def find_groups(self, local_files: Dict[str, float]) -> List[dict]:
+        """Duplicate groups among local_files ({path: mtime}), largest savings first"""
+        by_hash: Dict[str, List[str]] = {}
+        signatures: Dict[str, List[int]] = {}
+        sizes: Dict[str, int] = {}
+        for filepath in local_files:
+            # Shingling is the costly part, and exact matching only needs the hash
+            fingerprint = self.cache.fingerprint(filepath, signature=self.near)
+            # Empty files (package markers and the like) cost nothing to keep
+            if fingerprint is None or fingerprint[2] == 0:
+                continue
+            digest, signature, sizes[filepath] = fingerprint
+            by_hash.setdefault(digest, []).append(filepath)
+            if signature is not None:
+                signatures[digest] = signature
+        self.cache.save(sizes)
+
+        # Union-find over distinct contents; near-duplicate pairs join their sets
+        parent = {digest: digest for digest in by_hash}
+
+        def find(digest):
+            while parent[digest] != digest:
+                parent[digest] = parent[parent[digest]]
+                digest = parent[digest]
+            return digest
+
+        if self.near:
+            rows = NUM_PERM // BANDS
+            buckets: Dict[tuple, List[str]] = {}
+            for digest, signature in signatures.items():
+                if not signature:
+                    continue
+                for band in range(BANDS):
+                    key = (band, *signature[band * rows:(band + 1) * rows])
+                    buckets.setdefault(key, []).append(digest)
+
+            checked = set()
+            for candidates in buckets.values():
+                for i, first in enumerate(candidates):
+                    for second in candidates[i + 1:]:
+                        if (first, second) in checked:
+                            continue
+                        checked.add((first, second))
+                        if find(first) != find(second) and \
+                                similarity(signatures[first], signatures[second]) >= self.threshold:
+                            parent[find(first)] = find(second)
+
+        components: Dict[str, List[str]] = {}
+        for digest in by_hash:
+            components.setdefault(find(digest), []).append(digest)
+
+        groups = []
+        for remaining in components.values():
+            # Similarity isn't transitive, so a chain of small edits can join files that
+            # differ a lot. Keep only the contents similar enough to the representative
+            # itself, and group the rest around a representative of their own.
+            while remaining:
+                files = sorted(path for digest in remaining for path in by_hash[digest])
+                keep = self._representative(files, local_files)
+                kept_digest = next(digest for digest in remaining if keep in by_hash[digest])
+                digests = [digest for digest in remaining if digest == kept_digest or
+                           similarity(signatures[kept_digest], signatures[digest]) >= self.threshold]
+                remaining = [digest for digest in remaining if digest not in digests]
+
+                files = sorted(path for digest in digests for path in by_hash[digest])
+                if len(files) < 2:
+                    continue
+                groups.append({
+                    'kind': 'exact' if len(digests) == 1 else 'near',
+                    'keep': keep,
+                    'files': files,
+                    'sizes': {path: sizes[path] for path in files}
+                })
+
+        groups.sort(key=lambda group: (-(sum(group['sizes'].values()) - group['sizes'][group['keep']]),
+                                       group['keep']))
+        return groups
@@ -0,0 +1,294 @@
+import os
+import json
+import time
+import hashlib
+import collections
+import threading
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from claude_sync.utils.file_utils import write_text_atomic
+
+# Scanning is dominated by readdir/stat latency rather than CPU, so it pays to
+# keep more requests in flight than there are cores (NFS, sshfs, ...)
+DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Bumped whenever the cached layout or the meaning of a verdict changes
+SCAN_CACHE_VERSION = 1
+# A directory modified this close to the scan may change again within the same
+# mtime tick (up to 2s on FAT), so its listing isn't trusted next time
+RACY_WINDOW_NS = 2 * 10**9
+
+
+class ScanCache:
+    """
+    Outcome of reading each directory in the last scan, kept in .sync_scan_cache.json:
+    {reldir: {'mtime', 'rules', 'ignore', 'files', 'dirs', 'pruned'}}.
+
+    Adding, removing or renaming an entry changes a directory's mtime, so while
+    the mtime is unchanged the listing and the ignore verdicts can be reused and
+    only the kept files need a stat. 'rules' fingerprints the ignore files of the
+    directory and all its parents, so editing any of them redoes the verdicts below it.
+    """
+
+    def __init__(self, path: str = ".sync_scan_cache.json", ignore_name: str = ".syncignore"):
+        self.path = path
+        self.ignore_name = ignore_name
+        self.entries: Dict[str, dict] = self._load()
+        # Entries of the scan in progress; directories that are gone drop out
+        self.fresh: Dict[str, dict] = {}
+        self.started_ns = 0
+        # Directories of the last scan whose listing was reused or read again, shown by --debug
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, dict]:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == SCAN_CACHE_VERSION:
+                    return data.get('dirs', {})
+            except (ValueError, OSError) as e:
+                print(f"Warning: Ignoring unreadable scan cache {self.path}: {e}")
+        return {}
+
+    def begin(self):
+        self.fresh = {}
+        self.started_ns = time.time_ns()
+        self.hits = 0
+        self.misses = 0
+
+    def root_token(self) -> str:
+        return f"v{SCAN_CACHE_VERSION}"
+
+    def rules_token(self, dirpath: str, reldir: str, parent_token: str, has_ignore: bool) -> str:
+        """Fingerprint of the ignore files that apply inside reldir"""
+        if not has_ignore:
+            return parent_token
+        try:
+            st = os.stat(os.path.join(dirpath, self.ignore_name))
+        except OSError:
+            return parent_token
+        key = f"{parent_token}\0{reldir}\0{st.st_mtime_ns}\0{st.st_size}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def lookup(self, reldir: str, mtime_ns: int) -> Optional[dict]:
+        entry = self.entries.get(reldir)
+        if entry is not None and entry['mtime'] == mtime_ns:
+            return entry
+        return None
+
+    def store(self, reldir: str, mtime_ns: int, entry: dict):
+        entry['mtime'] = None if mtime_ns >= self.started_ns - RACY_WINDOW_NS else mtime_ns
+        # Each directory is read by a single worker, so plain assignment is enough
+        self.fresh[reldir] = entry
+
+    def save(self):
+        self.entries = self.fresh
+        write_text_atomic(self.path, json.dumps({'version': SCAN_CACHE_VERSION, 'dirs': self.entries}))
+
+
+class DirectoryScanner:
+    """
+    Multi-threaded directory walker.
+
+    Every worker owns a deque of directories. It takes work from the tail of its
+    own deque and, once that is empty, steals from the head of the others. The
+    result is sorted by path so the output does not depend on thread timing.
+
+    With a ScanCache, directories whose mtime hasn't changed since the last
+    full scan are not read again: their files are only stat'ed.
+    """
+
+    def __init__(self, workers: int = DEFAULT_SCAN_WORKERS,
+                 should_ignore: Optional[Callable[[str], bool]] = None,
+                 should_prune_dir: Optional[Callable[[str], bool]] = None,
+                 cache: Optional[ScanCache] = None):
+        self.workers = max(1, int(workers))
+        self.should_ignore = should_ignore or (lambda filepath: False)
+        self.should_prune_dir = should_prune_dir or (lambda dirpath: False)
+        self.cache = cache
+        # Excluded directories the last scan skipped without reading them
+        self.pruned_dirs: List[str] = []
+
+    def scan(self, root: str = '.', start: Sequence[str] = ('',),
+             value: Optional[Callable[[os.stat_result], Any]] = None) -> Dict[str, Any]:
+        """
+        Return {relative path: stat} for every non-ignored file under root.
+        start lists the directories (relative to root) to walk, by default root itself.
+        value, if given, maps each stat to what is kept, so large trees don't hold every stat.
+        """
+        # The cache describes whole scans from the root only
+        cache = self.cache if tuple(start) == ('',) else None
+        if cache is not None:
+            cache.begin()
+        token = cache.root_token() if cache is not None else None
+
+        # Queued items are (directory, rules token of its parent)
+        queues: List[Deque[Tuple[str, Optional[str]]]] = [collections.deque() for _ in range(self.workers)]
+        results: List[List[Tuple[str, Any]]] = [[] for _ in range(self.workers)]
+        pruned: List[List[str]] = [[] for _ in range(self.workers)]
+        cond = threading.Condition()
+        # Directories queued or being read; the scan is over when this drops to 0
+        pending = [len(start)]
+        for i, reldir in enumerate(start):
+            queues[i % self.workers].append((reldir, token))
+
+        def next_dir(index: int) -> Optional[Tuple[str, Optional[str]]]:
+            try:
+                return queues[index].pop()
+            except IndexError:
+                pass
+            for offset in range(1, self.workers):
+                try:
+                    return queues[(index + offset) % self.workers].popleft()
+                except IndexError:
+                    continue
+            return None
+
+        # First exception raised by a worker; the others stop and scan() re-raises it
+        errors: List[BaseException] = []
+
+        def worker(index: int):
+            while True:
+                item = next_dir(index)
+                if item is None:
+                    with cond:
+                        if pending[0] == 0 or errors:
+                            return
+                        cond.wait(0.01)
+                    continue
+
+                reldir, parent_token = item
+                subdirs = []
+                try:
+                    if cache is not None:
+                        subdirs = self._read_dir_cached(root, reldir, parent_token, cache,
+                                                        results[index], pruned[index], value)
+                    else:
+                        subdirs = [(subdir, None) for subdir in
+                                   self._read_dir(root, reldir, results[index], pruned[index], value)]
+                except BaseException as e:
+                    with cond:
+                        errors.append(e)
+                finally:
+                    # Always account for the directory, or the other workers would wait forever
+                    with cond:
+                        pending[0] += len(subdirs) - 1
+                        queues[index].extend(subdirs)
+                        if subdirs or pending[0] == 0 or errors:
+                            cond.notify_all()
+                if errors:
+                    return
+
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+        if cache is not None:
+            cache.save()
+        self.pruned_dirs = sorted(dirpath for part in pruned for dirpath in part)
+        merged = [item for part in results for item in part]
+        merged.sort(key=lambda item: item[0])
+        return dict(merged)
+
+    def _read_dir(self, root: str, reldir: str, out: List[Tuple[str, Any]],
+                  pruned: List[str], value: Optional[Callable[[os.stat_result], Any]] = None) -> List[str]:
+        """Stat the files of one directory into out and return its subdirectories"""
+        subdirs = []
+        try:
+            entries = list(os.scandir(os.path.join(root, reldir) if reldir else root))
+        except OSError:
+            # Same as os.walk: unreadable directories are skipped
+            return subdirs
+        return self._classify(reldir, entries, out, pruned, value)
+
+    def _classify(self, reldir: str, entries: List[os.DirEntry], out: List[Tuple[str, Any]],
+                  pruned: List[str], value: Optional[Callable[[os.stat_result], Any]] = None,
+                  kept: Optional[List[str]] = None) -> List[str]:
+        """
+        Sort one directory's entries into kept files, pruned directories and subdirectories.
+        kept, if given, also receives kept files that could not be stat'ed (broken symlinks).
+        """
+        subdirs = []
+        for entry in entries:
+            filepath = os.path.join(reldir, entry.name) if reldir else entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                # Like os.walk, don't descend into symlinked directories
+                if entry.is_symlink():
+                    continue
+                if self.should_prune_dir(filepath):
+                    pruned.append(filepath)
+                else:
+                    subdirs.append(filepath)
+                continue
+
+            if self.should_ignore(filepath):
+                continue
+            if kept is not None:
+                kept.append(entry.name)
+            try:
+                st = entry.stat()
+                out.append((filepath, value(st) if value else st))
+            except OSError:
+                # Broken symlink or the file vanished while scanning
+                continue
+        return subdirs
+
+    def _read_dir_cached(self, root: str, reldir: str, parent_token: str, cache: ScanCache,
+                         out: List[Tuple[str, Any]], pruned: List[str],
+                         value: Optional[Callable[[os.stat_result], Any]] = None) -> List[Tuple[str, str]]:
+        """Like _read_dir, but reuse the cached listing and verdicts while they are still valid"""
+        dirpath = os.path.join(root, reldir) if reldir else root
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            return []
+
+        entry = cache.lookup(reldir, mtime_ns)
+        if entry is not None:
+            token = cache.rules_token(dirpath, reldir, parent_token, entry['ignore'])
+            if token == entry['rules']:
+                cache.hits += 1
+                for name in entry['files']:
+                    filepath = os.path.join(reldir, name) if reldir else name
+                    try:
+                        st = os.stat(os.path.join(root, filepath))
+                    except OSError:
+                        continue
+                    out.append((filepath, value(st) if value else st))
+                pruned.extend(os.path.join(reldir, name) if reldir else name for name in entry['pruned'])
+                cache.store(reldir, mtime_ns, entry)
+                return [(os.path.join(reldir, name) if reldir else name, token) for name in entry['dirs']]
+
+        cache.misses += 1
+        try:
+            entries = list(os.scandir(dirpath))
+        except OSError:
+            return []
+        has_ignore = any(entry.name == cache.ignore_name for entry in entries)
+        token = cache.rules_token(dirpath, reldir, parent_token, has_ignore)
+
+        kept: List[str] = []
+        skipped: List[str] = []
+        subdirs = self._classify(reldir, entries, out, skipped, value, kept)
+        pruned.extend(skipped)
+
+        name_start = len(reldir) + 1 if reldir else 0
+        cache.store(reldir, mtime_ns, {
+            'rules': token,
+            'ignore': has_ignore,
+            'files': kept,
+            'dirs': [subdir[name_start:] for subdir in subdirs],
+            'pruned': [dirpath[name_start:] for dirpath in skipped]
+        })
+        return [(subdir, token) for subdir in subdirs]
@@ -0,0 +1,72 @@
+import os
+import fnmatch
+import itertools
+from typing import Iterator, List, Sequence
+from claude_sync.core.file_state import FileState, SyncAction, SyncStateStore
+
+# Uploads and deletes are latency-bound, so a sync keeps several in flight
+DEFAULT_SYNC_WORKERS = 4
+
+
+class SyncScheduler:
+    """
+    Decides the order in which a sync runs its operations.
+
+    Uploads and replaces are ordered by the priority globs (files matching an
+    earlier glob first), then by order: 'path', 'recent' (most recently
+    modified first) or 'small' (smallest first), so the files that matter are
+    consistent soonest. Orphan deletes are spread evenly between them instead
+    of waiting for every upload to finish.
+    """
+
+    ORDERS = ('path', 'recent', 'small')
+
+    def __init__(self, order: str = 'path', priority_globs: Sequence[str] = ()):
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown sync_order '{order}', expected one of {', '.join(self.ORDERS)}")
+        self.order = order
+        self.priority_globs = list(priority_globs)
+
+    def _glob_rank(self, filepath: str) -> int:
+        for rank, pattern in enumerate(self.priority_globs):
+            if fnmatch.fnmatch(filepath, pattern):
+                return rank
+        return len(self.priority_globs)
+
+    def _order_key(self, info: FileState):
+        rank = self._glob_rank(info.path)
+        if self.order == 'path':
+            return rank, 0, info.path
+        try:
+            st = os.stat(info.path)
+        except OSError:
+            # Vanished since the scan; it will fail fast, so let it go last
+            return rank, float('inf'), info.path
+        if self.order == 'recent':
+            return rank, -st.st_mtime, info.path
+        return rank, st.st_size, info.path
+
+    @staticmethod
+    def _interleave(first: List[FileState], second: Iterator[FileState], second_count: int) -> Iterator[FileState]:
+        """Merge second (second_count items) into first at an even spacing, keeping the order of both"""
+        taken = 0
+        for i, item in enumerate(first, 1):
+            yield item
+            due = second_count * i // len(first)
+            yield from itertools.islice(second, due - taken)
+            taken = due
+        yield from second
+
+    def plan(self, status: SyncStateStore) -> Iterator[FileState]:
+        """
+        Operations of a sync (uploads, replaces and deletes) in the order to run them.
+        Only the uploads and replaces are held, to sort them; deletes are read from
+        the status as they come due.
+        """
+        pushes = sorted(status.select(SyncAction.UPLOAD, SyncAction.REPLACE), key=self._order_key)
+        return self._interleave(pushes, status.deletions(), status.count(SyncAction.DELETE))
+
+    @staticmethod
+    def total(status: SyncStateStore) -> int:
+        """Number of operations plan() yields"""
+        return status.count(SyncAction.UPLOAD, SyncAction.REPLACE, SyncAction.DELETE)
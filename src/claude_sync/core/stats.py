@@ -0,0 +1,83 @@
+import os
+import heapq
+from typing import Dict, List, Tuple
+from claude_sync.core.scanner import DirectoryScanner
+
+# Rough averages used for the projections; Claude tokenizes about 4 characters
+# per token and each uploaded file costs one POST
+CHARS_PER_TOKEN = 4
+ESTIMATED_SECONDS_PER_REQUEST = 0.5
+ESTIMATED_UPLOAD_BYTES_PER_SECOND = 1024 * 1024
+
+
+def estimate_tokens(size: int) -> int:
+    """Estimate the number of tokens in size bytes of text"""
+    return size // CHARS_PER_TOKEN
+
+
+class ProjectStats:
+    """Size breakdown of the files a sync would upload, gathered in one scan"""
+
+    def __init__(self, scanner: DirectoryScanner, top: int = 10):
+        files = scanner.scan('.')
+
+        self.total_files = len(files)
+        self.total_bytes = 0
+        # {key: [file count, bytes]}
+        self.by_extension: Dict[str, List[int]] = {}
+        self.by_directory: Dict[str, List[int]] = {}
+
+        for filepath, st in files.items():
+            size = st.st_size
+            self.total_bytes += size
+
+            _, ext = os.path.splitext(filepath)
+            ext = ext.lower() if ext else "[no extension]"
+            entry = self.by_extension.setdefault(ext, [0, 0])
+            entry[0] += 1
+            entry[1] += size
+
+            top_dir = filepath.split(os.sep, 1)[0] + os.sep if os.sep in filepath else "."
+            entry = self.by_directory.setdefault(top_dir, [0, 0])
+            entry[0] += 1
+            entry[1] += size
+
+        self.largest_files: List[Tuple[str, int]] = heapq.nlargest(
+            top, ((filepath, st.st_size) for filepath, st in files.items()),
+            key=lambda item: item[1]
+        )
+        self.ignored_dirs = self._measure_ignored(scanner.pruned_dirs, scanner.workers, top)
+
+    @staticmethod
+    def _measure_ignored(pruned_dirs: List[str], workers: int, top: int) -> List[Tuple[str, int, int]]:
+        """Return the heaviest skipped directories as (path, file count, bytes)"""
+        if not pruned_dirs:
+            return []
+
+        # The skipped directories are never nested, so one unfiltered scan
+        # started from all of them attributes each file to exactly one of them
+        totals = {dirpath: [0, 0] for dirpath in pruned_dirs}
+        for filepath, st in DirectoryScanner(workers=workers).scan('.', start=pruned_dirs).items():
+            dirpath = filepath
+            while dirpath not in totals:
+                dirpath = os.path.dirname(dirpath)
+            totals[dirpath][0] += 1
+            totals[dirpath][1] += st.st_size
+
+        heaviest = heapq.nlargest(top, totals.items(), key=lambda item: item[1][1])
+        return [(dirpath, count, size) for dirpath, (count, size) in heaviest]
+
+    @property
+    def estimated_tokens(self) -> int:
+        return estimate_tokens(self.total_bytes)
+
+    @property
+    def projected_requests(self) -> int:
+        """Requests needed by a full sync of an empty remote project"""
+        return self.total_files
+
+    @property
+    def projected_seconds(self) -> float:
+        """Rough duration of a full sync of an empty remote project"""
+        return (self.projected_requests * ESTIMATED_SECONDS_PER_REQUEST +
+                self.total_bytes / ESTIMATED_UPLOAD_BYTES_PER_SECOND)
@@ -0,0 +1,71 @@
+import os
+import json
+import threading
+from typing import Dict, Optional, Set
+from claude_sync.utils.file_utils import write_text_atomic
+
+
+class SyncManifest:
+    """
+    What each path looked like at its last successful push or pull:
+    {path: {'uuid': remote doc id, 'hash': content hash, 'remote_updated_at': timestamp}}.
+    Comparing against it tells which side changed since then.
+
+    It also carries the scrub state: the path the last scrub stopped at and
+    the files whose remote copy was found to no longer match.
+    """
+
+    def __init__(self, path: str = ".sync_state.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Re-read the state, picking up changes saved by another process"""
+        data = self._load()
+        with self._lock:
+            self.entries: Dict[str, dict] = data.get('files', {})
+            scrub = data.get('scrub', {})
+            self.scrub_cursor: Optional[str] = scrub.get('cursor')
+            self.drifted: Set[str] = set(scrub.get('drifted', []))
+
+    def _load(self) -> dict:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except (ValueError, OSError) as e:
+                print(f"Warning: Ignoring unreadable sync state {self.path}: {e}")
+        return {}
+
+    def get(self, filepath: str) -> Optional[dict]:
+        return self.entries.get(filepath)
+
+    def record(self, filepath: str, uuid: str, content_hash: str, remote_updated_at: Optional[str]):
+        """Remember that filepath and remote doc uuid both hold content_hash"""
+        with self._lock:
+            self.entries[filepath] = {
+                'uuid': uuid,
+                'hash': content_hash,
+                'remote_updated_at': remote_updated_at
+            }
+            # A fresh push or pull repairs any drift
+            self.drifted.discard(filepath)
+
+    def forget(self, filepath: str):
+        with self._lock:
+            self.entries.pop(filepath, None)
+            self.drifted.discard(filepath)
+
+    def mark_drifted(self, filepath: str):
+        """Queue filepath for re-upload: its remote copy no longer holds the recorded content"""
+        with self._lock:
+            self.drifted.add(filepath)
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({
+                'files': self.entries,
+                'scrub': {'cursor': self.scrub_cursor, 'drifted': sorted(self.drifted)}
+            }, indent=1, sort_keys=True)
+        write_text_atomic(self.path, data)
@@ -1,12 +1,35 @@
 # Update to src/claude_sync/core/syncer.py
 
 import os
-from typing import Dict, Set, Tuple, Counter
+import math
+import time
+import bisect
+import itertools
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 import collections
 from claude_sync.api.client import APIClient
+from claude_sync.api.remote_index import RemoteDoc
+from claude_sync.core.chunker import (ContentChunker, RemoteFile, assemble_chunks, chunk_file_name,
+                                      chunk_hash, chunk_identity, chunk_index_name, group_remote_files,
+                                      DEFAULT_CHUNK_SIZE)
 from claude_sync.core.config_manager import ConfigManager
+from claude_sync.core.dedupe import DuplicateDetector, FingerprintCache, DEFAULT_SIMILARITY
+from claude_sync.core.file_state import FileState, SyncAction, SyncStateStore
+from claude_sync.core.scanner import DirectoryScanner, ScanCache, DEFAULT_SCAN_WORKERS
+from claude_sync.core.scheduler import SyncScheduler, DEFAULT_SYNC_WORKERS
+from claude_sync.core.stats import ProjectStats
+from claude_sync.core.sync_state import SyncManifest
+from claude_sync.utils.file_utils import hash_content, read_text, write_text_atomic
 from claude_sync.utils.ignore_parser import GitignoreParser
+from claude_sync.utils.progress import ProgressMeter
+
+# Downloads are latency-bound, so pull keeps several requests in flight
+DEFAULT_PULL_WORKERS = 8
+
+# Remote docs a scrub may fetch when no budget is given
+DEFAULT_SCRUB_REQUESTS = 20
 
 class FileSyncer:
     def __init__(self, debug: bool = False):
@@ -16,22 +39,42 @@ class FileSyncer:
         self.config = self.config_manager._load_config()
         self.api_client = APIClient(self.config)
         self.first_run = not os.path.exists('.syncignore')
+        self.manifest = SyncManifest()
+        # Files of at least chunk_threshold characters are stored as content-defined chunks
+        self.chunk_threshold = self.config.get('chunk_threshold')
+        self.chunker = (ContentChunker(self.config.get('chunk_size', DEFAULT_CHUNK_SIZE))
+                        if self.chunk_threshold else None)
+        # Upload one file per group of duplicates: None (off), 'exact' or 'near'
+        self.dedupe = self.config.get('dedupe')
+        if self.dedupe not in (None, 'exact', 'near'):
+            raise ValueError(f"Unknown dedupe setting '{self.dedupe}', expected 'exact' or 'near'")
+        self.scanner = DirectoryScanner(
+            workers=self.config.get('scan_workers', DEFAULT_SCAN_WORKERS),
+            should_ignore=self.ignore_parser.should_ignore,
+            should_prune_dir=self.ignore_parser.should_prune_dir,
+            # Reuse the listings of directories that haven't changed since the last scan
+            cache=ScanCache(ignore_name=self.ignore_parser.ignore_name)
+            if self.config.get('scan_cache', True) else None
+        )
+        # Order of uploads and deletes: by priority globs, then 'path', 'recent' or 'small'
+        self.scheduler = SyncScheduler(self.config.get('sync_order', 'path'),
+                                       self.config.get('sync_priority', []))
+        # Counters of the running (or last) sync, for callers that embed the syncer
+        self.progress: Optional[ProgressMeter] = None
 
     def get_local_files(self) -> Dict[str, float]:
         """Get local files with their modification timestamps"""
-        files = {}
-        
         if self.debug:
-            print("\nDebug: Scanning local files...")
+            print(f"\nDebug: Scanning local files with {self.scanner.workers} workers...")
             
-        for root, _, filenames in os.walk('.'):
-            for filename in filenames:
-                filepath = os.path.relpath(os.path.join(root, filename))
-                if not self.ignore_parser.should_ignore(filepath):
-                    mtime = os.path.getmtime(filepath)
-                    files[filepath] = mtime
-                    if self.debug:
-                        print(f"  {filepath}: {datetime.fromtimestamp(mtime)}")
+        files = self.scanner.scan('.', value=lambda st: st.st_mtime)
+
+        if self.debug:
+            cache = self.scanner.cache
+            if cache:
+                print(f"Debug: Scan cache reused {cache.hits} directory listings, read {cache.misses}")
+            for filepath, mtime in files.items():
+                print(f"  {filepath}: {datetime.fromtimestamp(mtime)}")
                         
         return files
     
@@ -48,14 +91,47 @@ class FileSyncer:
         extension_counts = collections.Counter(extensions)
         return extension_counts
 
-    def get_sync_status(self) -> Tuple[Dict[str, dict], Dict[str, dict]]:
-        """Get sync status comparing local and remote state"""
-        local_files = self.get_local_files()
+    def get_project_stats(self, top: int = 10) -> ProjectStats:
+        """Analyze sizes of the files that would be synced in a single scan"""
+        return ProjectStats(self.scanner, top=top)
+
+    def get_duplicate_groups(self, local_files: Optional[Dict[str, float]] = None,
+                             near: bool = True) -> List[dict]:
+        """Group local files with identical (and, if near, nearly identical) content"""
+        if local_files is None:
+            local_files = self.get_local_files()
+        detector = DuplicateDetector(
+            FingerprintCache(),
+            threshold=self.config.get('dedupe_threshold', DEFAULT_SIMILARITY),
+            near=near,
+            keep=self.config.get('dedupe_keep', 'shortest')
+        )
+        return detector.find_groups(local_files)
+
+    def _drop_duplicates(self, local_files: Dict[str, float]) -> Dict[str, float]:
+        """Leave out all but the representative of each duplicate group, per the dedupe setting"""
+        groups = self.get_duplicate_groups(local_files, near=self.dedupe == 'near')
+        skipped = {path for group in groups for path in group['files'] if path != group['keep']}
+        if not skipped:
+            return local_files
         
+        print(f"\nSkipping {len(skipped)} duplicate files (dedupe: {self.dedupe}, see --duplicates)")
+        # Copies uploaded before dedupe was enabled are cleaned up like deleted files
+        return {path: mtime for path, mtime in local_files.items() if path not in skipped}
+
+    def get_sync_status(self, local_files: Optional[Dict[str, float]] = None,
+                        remote_files: Optional[Iterable[RemoteDoc]] = None) -> SyncStateStore:
+        """
+        Get sync status comparing local and remote state.
+        Local entries come first, in scan (path) order, followed by the remote files to delete.
+        Callers that already hold a scan or a remote listing (the daemon) can pass them in.
+        """
         # If this is the first run, create default .syncignore and show extensions summary
         if self.first_run:
             self.config_manager._create_default_syncignore()
-            extension_counts = self.get_file_extensions_summary(local_files)
+            # Count only what the new ignore rules would let through
+            self.ignore_parser.reload()
+            extension_counts = self.get_file_extensions_summary(self.get_local_files())
             
             print("\nFirst run detected! Created default .syncignore file.")
             print("\nFile extensions found in your project:")
@@ -65,84 +141,152 @@ class FileSyncer:
                 
             print("\nNext run will use these ignore rules for syncing.")
             print("You can modify .syncignore file to customize which files to sync.")
+            print("Run with --stats to see sizes and the directories being skipped.")
             
             # Return empty data to trigger exit
-            return {}, {}
+            return SyncStateStore()
         
         # Normal flow for subsequent runs
-        remote_files = self.api_client.list_remote_files()
+        if local_files is None:
+            local_files = self.get_local_files()
+        if self.dedupe:
+            local_files = self._drop_duplicates(local_files)
+        if remote_files is None:
+            # Consume the listing as it streams in rather than holding it as a list
+            remote_files = self.api_client.iter_remote_files()
+
+        # Index remote files by their name/path, with chunk docs folded into their file
+        remote_state = group_remote_files(remote_files)
 
         if self.debug:
             print("\nDebug: Remote files response:")
-            print(remote_files)
-            
-        # Index remote files by their name/path
-        remote_state = {}
-        for file in remote_files:
-            # Try to get local path from metadata, fallback to filename
-            local_path = file.get('metadata', {}).get('local_path', file['file_name'])
-            remote_state[local_path] = {
-                'id': file['uuid'],  # API returns 'uuid' instead of 'id'
-                'updated_at': file.get('updated_at', file.get('created_at')),
-                'content_hash': file.get('content_hash')
-            }
-
-        # Track files to sync and remote files to delete
-        sync_status = {}
-        delete_status = {}
+            for remote_info in remote_state.values():
+                for file in remote_info.docs:
+                    print(f"  {file}")
+
+        # One compact entry per local file, then one per orphaned remote file
+        status = SyncStateStore()
 
         # Check local files that need syncing
         for filepath, local_mtime in local_files.items():
-            remote_info = remote_state.get(filepath)
+            # Whatever is left in remote_state afterwards has no local counterpart
+            remote_info = remote_state.pop(filepath, None)
             
             if not remote_info:
                 # File doesn't exist remotely
-                sync_status[filepath] = {
-                    'needs_sync': True,
-                    'last_sync': 'Never',
-                    'action': 'upload'
-                }
+                status.add(filepath, SyncAction.UPLOAD)
+            elif filepath in self.manifest.drifted:
+                # A scrub found the remote copy changed behind our back
+                self._add_remote_entry(status, filepath, SyncAction.REPLACE, remote_info, repair=True)
+            elif remote_info.stale or remote_info.incomplete:
+                # Several copies of a doc, or chunks an interrupted push left behind: re-push to settle it
+                self._add_remote_entry(status, filepath, SyncAction.REPLACE, remote_info)
             else:
                 # Convert remote time to UTC
-                remote_time = datetime.fromisoformat(remote_info['updated_at'].replace('Z', '+00:00'))
+                remote_time = datetime.fromisoformat(remote_info.updated_at.replace('Z', '+00:00'))
                 # Convert local time to UTC aware datetime
                 local_time = datetime.fromtimestamp(local_mtime).astimezone()
                 
                 # Compare using timestamps to avoid timezone issues
-                if local_time.timestamp() > remote_time.timestamp():
-                    sync_status[filepath] = {
-                        'needs_sync': True,
-                        'last_sync': remote_info['updated_at'],
-                        'action': 'replace',
-                        'remote_id': remote_info['id']  # This is the UUID from our earlier mapping
-                    }
+                if local_time.timestamp() > remote_time.timestamp() and not self._matches_last_sync(filepath, remote_info):
+                    self._add_remote_entry(status, filepath, SyncAction.REPLACE, remote_info)
                 else:
-                    sync_status[filepath] = {
-                        'needs_sync': False,
-                        'last_sync': remote_info['updated_at'],
-                        'action': None
-                    }
+                    status.add(filepath, SyncAction.NONE, remote_info.updated_at)
 
         # Check remote files that need deletion
-        for remote_file in remote_files:
-            local_path = remote_file.get('metadata', {}).get('local_path', remote_file['file_name'])
-            if local_path not in local_files:
-                delete_status[local_path] = {
-                    'id': remote_file['uuid'],  # API returns 'uuid' instead of 'id'
-                    'last_updated': remote_file.get('updated_at', remote_file.get('created_at'))
-                }
-
-        return sync_status, delete_status
-
-    def sync_files(self, dry_run: bool = False):
-        """Sync files that need updating and clean up orphaned remote files"""
-        sync_status, delete_status = self.get_sync_status()
-        
-        # If first run (empty sync_status), just exit
-        if self.first_run or not sync_status:
-            return
+        for local_path, remote_file in remote_state.items():
+            self._add_remote_entry(status, local_path, SyncAction.DELETE, remote_file)
+
+        return status
+
+    @staticmethod
+    def _add_remote_entry(status: SyncStateStore, filepath: str, action: SyncAction,
+                          remote_info: RemoteFile, **extra):
+        """Add an entry that has to act on the existing remote docs of a file"""
+        if remote_info.chunks:
+            extra['remote_chunks'] = remote_info.chunk_info()
+        if remote_info.index:
+            extra['remote_index'] = remote_info.index.uuid
+        if remote_info.stale:
+            extra['stale_ids'] = [doc.uuid for doc in remote_info.stale]
+        status.add(filepath, action, remote_info.updated_at,
+                   remote_info.doc.uuid if remote_info.doc else None, **extra)
+
+    def _matches_last_sync(self, filepath: str, remote_info: RemoteFile) -> bool:
+        """Whether a file only looks modified: same content and remote docs as at its last sync"""
+        entry = self.manifest.get(filepath)
+        if not entry or entry['uuid'] != remote_info.identity:
+            return False
+        try:
+            return hash_content(read_text(filepath)) == entry['hash']
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def _push_file(self, filepath: str, info: FileState):
+        """Upload one local file, as a single doc or as content-defined chunks"""
+        content = read_text(filepath)
+        remote_chunks = info.remote_chunks
+        
+        if self.chunker and len(content) >= self.chunk_threshold:
+            chunks = self.chunker.split(content)
+            existing = {chunk['hash']: chunk['uuid'] for chunk in remote_chunks}
+            if info.extra.get('repair'):
+                # A chunk's name no longer vouches for its content, so upload them all
+                stale_chunks, existing = list(existing.values()), {}
+            else:
+                stale_chunks = []
+            uuids: Dict[str, str] = {}
+            order = []
             
-        files_to_sync = {f: s for f, s in sync_status.items() if s['needs_sync']}
+            # Only chunks with new content are uploaded, wherever the others moved to
+            for chunk in chunks:
+                digest = chunk_hash(chunk)
+                order.append(digest)
+                if digest in uuids:
+                    continue
+                uuid = existing.pop(digest, None)
+                if uuid is None:
+                    uuid = self.api_client.upload_content(chunk_file_name(filepath, digest), chunk).get('uuid')
+                uuids[digest] = uuid
+            
+            # The new index goes up once all its chunks are there, so an interrupted
+            # push leaves the previous version readable
+            doc = self.api_client.upload_content(chunk_index_name(filepath), '\n'.join(order) + '\n')
+            
+            # Then drop the old index, chunks that are gone, and the whole-file doc if
+            # the file wasn't chunked before
+            stale = (stale_chunks + list(existing.values()) +
+                     ([info.extra['remote_index']] if info.extra.get('remote_index') else []) +
+                     ([info.remote_id] if info.remote_id else []) + info.stale_ids)
+            for doc_id in stale:
+                self.api_client.delete_file(doc_id)
+            
+            self.manifest.record(filepath, chunk_identity([doc.get('uuid')] + list(uuids.values())),
+                                 hash_content(content), doc.get('updated_at', doc.get('created_at')))
+            return
+        
+        # Upload the new version first, so the file is never missing remotely
+        doc = self.api_client.upload_content(filepath, content)
+        self.manifest.record(filepath, doc.get('uuid'), hash_content(content),
+                             doc.get('updated_at', doc.get('created_at')))
+        
+        # Then drop the old version, including chunks if the file was stored as chunks before.
+        # If this fails, the next status sees several docs for the path and replaces it again.
+        for doc_id in ([info.remote_id] if info.remote_id else []) + info.chunk_ids + info.stale_ids:
+            self.api_client.delete_file(doc_id)
+
+    def sync_files(self, dry_run: bool = False, status: Optional[SyncStateStore] = None,
+                   progress: Optional[ProgressMeter] = None):
+        """
+        Sync files that need updating and clean up orphaned remote files.
+        Progress is shown on one line; pass a meter to control where it goes.
+        """
+        if status is None:
+            status = self.get_sync_status()
+        
+        # If first run (empty status), just exit
+        if self.first_run or not status:
+            return
         
         # Track operation counts for summary
         summary = {
@@ -150,66 +294,75 @@ class FileSyncer:
             'replaced': 0,
             'deleted': 0,
             'failed': 0,
-            'skipped': len(sync_status) - len(files_to_sync),
+            'skipped': status.count(SyncAction.NONE),
             'errors': []
         }
         
+        plan = self.scheduler.plan(status)
+        total_ops = self.scheduler.total(status)
+        
         if dry_run:
-            print(f"\nWould perform the following operations:")
-            
-            if files_to_sync:
-                print("\nFiles to sync:")
-                for filepath, info in files_to_sync.items():
-                    action = "Upload new file" if info['action'] == 'upload' else "Replace existing file"
-                    print(f"  {filepath} - {action}")
-            
-            if delete_status:
-                print("\nRemote files to delete:")
-                for filepath in delete_status:
-                    print(f"  {filepath}")
-                    
+            print(f"\nWould perform the following operations, in this order:")
+            for info in plan:
+                if info.action == SyncAction.DELETE:
+                    action = "Delete remote file"
+                else:
+                    action = "Upload new file" if info.action == SyncAction.UPLOAD else "Replace existing file"
+                print(f"  {info.path} - {action}")
             return
         
-        # First, handle file uploads and replacements
-        for filepath, info in files_to_sync.items():
-            try:
-                print(f"\nSyncing {filepath}...")
-                
-                # If replacing, delete old file first
-                if info['action'] == 'replace':
-                    print(f"  Deleting old remote version...")
-                    self.api_client.delete_file(info['remote_id'])
-                
-                # Upload new version
-                print(f"  Uploading new version...")
-                self.api_client.upload_file(filepath, local_path=filepath)
-                print(f"Successfully synced {filepath}")
-                
-                # Update summary
-                if info['action'] == 'upload':
-                    summary['uploaded'] += 1
-                else:
-                    summary['replaced'] += 1
-                    
-            except Exception as e:
-                error_msg = f"Error syncing {filepath}: {str(e)}"
-                print(error_msg)
-                summary['failed'] += 1
-                summary['errors'].append(error_msg)
-
-        # Then, clean up orphaned remote files
-        if delete_status:
-            print("\nCleaning up remote files...")
-            for filepath, info in delete_status.items():
+        if progress is None:
+            total_bytes = 0
+            for info in status.select(SyncAction.UPLOAD, SyncAction.REPLACE):
                 try:
-                    print(f"  Deleting {filepath}...")
-                    self.api_client.delete_file(info['id'])
-                    summary['deleted'] += 1
-                except Exception as e:
-                    error_msg = f"Error deleting {filepath}: {str(e)}"
-                    print(error_msg)
-                    summary['failed'] += 1
-                    summary['errors'].append(error_msg)
+                    total_bytes += os.path.getsize(info.path)
+                except OSError:
+                    pass
+            progress = ProgressMeter(total_ops, total_bytes)
+        self.progress = progress
+        self.api_client.on_request = progress.request
+        
+        # Seconds from the start until each operation completed, for time-to-consistency
+        finished_at = []
+        started_at = time.monotonic()
+        workers = self.config.get('sync_workers', DEFAULT_SYNC_WORKERS)
+        
+        try:
+            # The pool takes operations in plan order, so priorities hold while several run at once.
+            # Only a couple per worker are queued at a time, so a huge plan doesn't become
+            # a future per file.
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self._run_operation, info, progress): info
+                           for info in itertools.islice(plan, workers * 2)}
+                
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        info = futures.pop(future)
+                        for following in itertools.islice(plan, 1):
+                            futures[executor.submit(self._run_operation, following, progress)] = following
+                        try:
+                            future.result()
+                        except Exception as e:
+                            verb = "deleting" if info.action == SyncAction.DELETE else "syncing"
+                            error_msg = f"Error {verb} {info.path}: {str(e)}"
+                            progress.log(error_msg)
+                            summary['failed'] += 1
+                            summary['errors'].append(error_msg)
+                            continue
+                        
+                        finished_at.append(time.monotonic() - started_at)
+                        # Update summary
+                        if info.action == SyncAction.UPLOAD:
+                            summary['uploaded'] += 1
+                        elif info.action == SyncAction.REPLACE:
+                            summary['replaced'] += 1
+                        else:
+                            summary['deleted'] += 1
+        finally:
+            self.api_client.on_request = None
+            progress.close()
+            self.manifest.save()
 
         # Print summary
         print("\nSync Summary:")
@@ -218,8 +371,232 @@ class FileSyncer:
         print(f"  {summary['deleted']} remote files deleted")
         print(f"  {summary['skipped']} files skipped (up to date)")
         print(f"  {summary['failed']} operations failed")
+        if total_ops:
+            milestones = []
+            for fraction in (0.5, 0.9, 1.0):
+                # Completion time of the operation that brought the sync to this fraction
+                index = max(1, math.ceil(total_ops * fraction)) - 1
+                reached = f"{finished_at[index]:.1f}s" if index < len(finished_at) else "not reached"
+                milestones.append(f"{fraction:.0%} {reached}")
+            print(f"  Time to consistency: {', '.join(milestones)}")
+        snap = progress.snapshot()
+        print(f"  {snap['requests']} requests, {snap['bytes_sent']} bytes sent in {snap['elapsed']:.1f}s")
+        
+        if summary['errors']:
+            print("\nErrors encountered:")
+            for error in summary['errors']:
+                print(f"  {error}")
+
+    def _run_operation(self, info: FileState, progress: ProgressMeter):
+        """Carry out one planned upload, replace or delete"""
+        progress.start()
+        try:
+            if info.action == SyncAction.DELETE:
+                for doc_id in ([info.remote_id] if info.remote_id else []) + info.chunk_ids + info.stale_ids:
+                    self.api_client.delete_file(doc_id)
+                self.manifest.forget(info.path)
+            else:
+                self._push_file(info.path, info)
+        except Exception:
+            progress.finish(failed=True)
+            raise
+        progress.finish()
+        if self.debug:
+            progress.log(f"{'Deleted' if info.action == SyncAction.DELETE else 'Synced'} {info.path}")
+
+    @staticmethod
+    def _is_safe_local_path(filepath: str) -> bool:
+        """Whether a path taken from remote metadata stays inside the project"""
+        normalized = os.path.normpath(filepath)
+        return not (os.path.isabs(normalized) or normalized == os.pardir or
+                    normalized.startswith(os.pardir + os.sep))
+
+    def _pull_one(self, filepath: str, remote_file: RemoteFile, dry_run: bool, force: bool) -> str:
+        """
+        Bring one remote doc down to filepath. Returns 'downloaded', 'unchanged',
+        'local_changes' (only the local copy changed since the last sync) or 'conflict'.
+        """
+        entry = self.manifest.get(filepath)
+        local_content = local_hash = None
+        
+        if os.path.exists(filepath):
+            local_content = read_text(filepath)
+            local_hash = hash_content(local_content)
+            if entry and entry['uuid'] == remote_file.identity:
+                # Remote is still the doc we last synced, no need to download it
+                return 'unchanged' if local_hash == entry['hash'] else 'local_changes'
+            if not remote_file.chunked and remote_file.doc.content_hash == local_hash:
+                # Not synced from here (a fresh checkout), but the listing's hash shows
+                # the local copy already matches
+                if not dry_run:
+                    self.manifest.record(filepath, remote_file.identity, local_hash, remote_file.updated_at)
+                return 'unchanged'
+        
+        # Local edits we haven't synced yet, while the remote changed too
+        local_changed = local_hash is not None and (entry is None or entry['hash'] != local_hash)
+        if dry_run:
+            return 'conflict' if local_changed and not force else 'downloaded'
+        
+        if remote_file.chunked:
+            index = self.api_client.get_file(remote_file.index.uuid) if remote_file.index else None
+            if index and local_content is not None and self.chunker and \
+                    [chunk_hash(chunk) for chunk in self.chunker.split(local_content)] == index['content'].split():
+                # The index lists the hash of every chunk, so a local copy that splits
+                # into the same chunks is recognized without downloading them
+                self.manifest.record(filepath, remote_file.identity, local_hash, remote_file.updated_at)
+                return 'unchanged'
+            # Otherwise the chunks are reassembled in the order the index lists
+            content = assemble_chunks(([index] if index else []) +
+                                      [self.api_client.get_file(doc.uuid) for doc in remote_file.chunks.values()])
+            if content is None:
+                raise ValueError("its remote chunks are incomplete (use --sync to upload it again)")
+        else:
+            content = self.api_client.get_file(remote_file.doc.uuid)['content']
+        remote_hash = hash_content(content)
+        
+        if remote_hash != local_hash:
+            if local_changed and not force:
+                return 'conflict'
+            # Stamp the remote time so the next push doesn't see the file as modified
+            remote_time = datetime.fromisoformat(remote_file.updated_at.replace('Z', '+00:00'))
+            write_text_atomic(filepath, content, mtime=remote_time.timestamp())
+        
+        self.manifest.record(filepath, remote_file.identity, remote_hash, remote_file.updated_at)
+        return 'downloaded' if remote_hash != local_hash else 'unchanged'
+
+    def pull_files(self, dry_run: bool = False, force: bool = False):
+        """Restore remote docs to their local paths, downloading several at a time"""
+        # Index remote files by their name/path, as get_sync_status does
+        remote_state = group_remote_files(self.api_client.iter_remote_files())
+        
+        summary = {
+            'downloaded': 0,
+            'unchanged': 0,
+            'local_changes': 0,
+            'conflicts': [],
+            'failed': 0,
+            'errors': []
+        }
+        
+        workers = self.config.get('pull_workers', DEFAULT_PULL_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for filepath, remote_file in remote_state.items():
+                if not self._is_safe_local_path(filepath):
+                    error_msg = f"Refusing to write {filepath}: path is outside the project"
+                    print(error_msg)
+                    summary['failed'] += 1
+                    summary['errors'].append(error_msg)
+                    continue
+                futures[executor.submit(self._pull_one, filepath, remote_file, dry_run, force)] = filepath
+            
+            for future in as_completed(futures):
+                filepath = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error_msg = f"Error pulling {filepath}: {str(e)}"
+                    print(error_msg)
+                    summary['failed'] += 1
+                    summary['errors'].append(error_msg)
+                    continue
+                
+                if result == 'conflict':
+                    summary['conflicts'].append(filepath)
+                else:
+                    summary[result] += 1
+                    if result == 'downloaded':
+                        print(f"  {'Would download' if dry_run else 'Downloaded'} {filepath}")
+        
+        if not dry_run:
+            self.manifest.save()
+        
+        # Print summary
+        print("\nPull Summary:")
+        print(f"  {summary['downloaded']} files {'to download' if dry_run else 'downloaded'}")
+        print(f"  {summary['unchanged']} files already up to date")
+        print(f"  {summary['local_changes']} files with local changes only (use --sync to upload)")
+        print(f"  {len(summary['conflicts'])} {'possible conflicts' if dry_run else 'conflicts'}")
+        print(f"  {summary['failed']} operations failed")
+        
+        if summary['conflicts'] and dry_run:
+            print("\nChanged locally while the remote changed too (contents are compared on download):")
+            for filepath in sorted(summary['conflicts']):
+                print(f"  {filepath}")
+        elif summary['conflicts']:
+            print("\nChanged both locally and remotely since the last sync (use --force to take the remote copy):")
+            for filepath in sorted(summary['conflicts']):
+                print(f"  {filepath}")
         
         if summary['errors']:
             print("\nErrors encountered:")
             for error in summary['errors']:
-                print(f"  {error}")
\ No newline at end of file
+                print(f"  {error}")
+
+    def _remote_hash(self, uuids: List[str]) -> Optional[str]:
+        """Hash of the content stored in the given docs, None if any of them is gone"""
+        try:
+            docs = [self.api_client.get_file(uuid) for uuid in uuids]
+        except ValueError:
+            # The API reports missing docs as not found
+            return None
+        # A chunked file is its index and chunks; a single doc holds the whole file
+        content = assemble_chunks(docs) if len(docs) > 1 else docs[0]['content']
+        return hash_content(content) if content is not None else None
+
+    def scrub(self, max_requests: Optional[int] = None, max_seconds: Optional[float] = None):
+        """
+        Check a budgeted sample of synced files against their remote docs and
+        queue the ones that drifted for repair on the next sync. Each run picks
+        up after the file the previous one stopped at, so successive scrubs
+        rotate through the whole project.
+        """
+        if max_requests is None and max_seconds is None:
+            max_requests = self.config.get('scrub_requests', DEFAULT_SCRUB_REQUESTS)
+            max_seconds = self.config.get('scrub_seconds')
+        
+        # Only files that still exist locally can be repaired
+        paths = sorted(path for path in self.manifest.entries if os.path.exists(path))
+        if not paths:
+            print("\nNothing has been synced yet, nothing to scrub.")
+            return
+        
+        start = bisect.bisect_right(paths, self.manifest.scrub_cursor or '') % len(paths)
+        started_at = time.monotonic()
+        requests = 0
+        checked = 0
+        drifted = []
+        error = None
+        
+        for path in paths[start:] + paths[:start]:
+            uuids = self.manifest.get(path)['uuid'].split(',')
+            if checked and max_requests is not None and requests + len(uuids) > max_requests:
+                break
+            if checked and max_seconds is not None and time.monotonic() - started_at >= max_seconds:
+                break
+            
+            try:
+                remote_hash = self._remote_hash(uuids)
+            except Exception as e:
+                error = f"Error checking {path}: {str(e)}"
+                break
+            
+            requests += len(uuids)
+            checked += 1
+            self.manifest.scrub_cursor = path
+            if remote_hash != self.manifest.get(path)['hash']:
+                self.manifest.mark_drifted(path)
+                drifted.append(path)
+                print(f"  Drifted: {path} ({'missing remotely' if remote_hash is None else 'remote content changed'})")
+        
+        self.manifest.save()
+        
+        # Print summary
+        print("\nScrub Summary:")
+        print(f"  {checked} of {len(paths)} synced files checked ({requests} requests, "
+              f"{time.monotonic() - started_at:.1f}s)")
+        print(f"  {len(drifted)} files drifted")
+        if self.manifest.drifted:
+            print(f"  {len(self.manifest.drifted)} files queued for repair (use --sync to re-upload)")
+        if error:
+            print(f"\n{error}")
@@ -0,0 +1,47 @@
+import os
+import hashlib
+import tempfile
+
+# Read once at import: os.umask can only be queried by setting it, which
+# isn't safe while several threads are writing files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def read_text(filepath: str) -> str:
+    """Read a file the way it is uploaded"""
+    with open(filepath, 'r') as f:
+        return f.read()
+
+
+def hash_content(content: str) -> str:
+    """Hash of uploaded text, used to tell whether two copies differ"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def write_text_atomic(filepath: str, content: str, mtime: float = None):
+    """
+    Write a file through a temporary sibling and rename it into place, so
+    readers never see a partial file. mtime, if given, is applied before the rename.
+    """
+    directory = os.path.dirname(filepath) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.claude-sync-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        if os.path.exists(filepath):
+            os.chmod(tmp_path, os.stat(filepath).st_mode & 0o7777)
+        else:
+            # mkstemp creates 0600 files; use the usual umask-based mode instead
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        if mtime is not None:
+            os.utime(tmp_path, (mtime, mtime))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
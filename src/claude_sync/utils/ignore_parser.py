@@ -1,103 +1,300 @@
 # Updated src/claude_sync/utils/ignore_parser.py
 
 import os
+import re
 import fnmatch
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# fnmatch.fnmatch folds case wherever os.path.normcase does
+_MATCH_FLAGS = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+
+
+def _compile(pattern: str):
+    """Compile a glob to a bound match function, once per pattern"""
+    return re.compile(fnmatch.translate(pattern), _MATCH_FLAGS).match
+
+
+def _compile_anchored(pattern: str):
+    """
+    Compile a glob the way git matches patterns containing a slash: '*', '?'
+    and '[...]' stay within one path component and only '**' crosses '/'.
+    """
+    regex = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            # Zero or more whole directories
+            regex.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            regex.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            regex.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            regex.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            j = i + 1
+            if j < n and pattern[j] == '!':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                regex.append('\\[')
+                i += 1
+                continue
+            stuff = pattern[i + 1:j].replace('\\', '\\\\')
+            if stuff.startswith('!'):
+                stuff = '^' + stuff[1:]
+            regex.append(f"(?!/)[{stuff}]")
+            i = j + 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(f"(?s:{''.join(regex)})\\Z", _MATCH_FLAGS).match
+
+
+def _ancestors(path: str) -> List[str]:
+    """The path itself preceded by each of its parent directories"""
+    parts = path.split('/')
+    return ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def _suffixes(path: str) -> List[str]:
+    """All trailing subpaths of path that start on a path component"""
+    parts = path.split('/')
+    return ['/'.join(parts[i:]) for i in range(len(parts))]
+
+
+class IgnoreRule:
+    """A single compiled pattern from a .syncignore file"""
+
+    __slots__ = ('is_include', 'pattern', 'anchored', '_glob', '_starglob', '_dirglob', '_prefix', '_anchored', '_anchored_parent')
+
+    def __init__(self, is_include: bool, pattern: str):
+        self.is_include = is_include
+        # A leading slash anchors the pattern to the directory of its .syncignore
+        self.anchored = pattern.startswith('/')
+        if self.anchored:
+            pattern = pattern[1:]
+        self.pattern = pattern
+        self._glob = _compile(pattern)
+        # '**' behaves like '*' since fnmatch's '*' already crosses slashes
+        self._starglob = _compile(pattern.replace('**', '*')) if '**' in pattern else None
+        self._dirglob = pattern[:-1] if pattern.endswith('/') else None
+        # Everything up to a trailing '*', used to tell if the rule covers a whole directory
+        self._prefix = _compile(pattern.replace('**', '*')[:-1]) if pattern.endswith('*') else None
+        # Anchored rules match path components one by one instead of fnmatch-style
+        self._anchored = _compile_anchored(pattern.rstrip('/')) if self.anchored else None
+        # For anchored 'dir/*' and 'dir/**': dir, all of whose contents the rule matches
+        parent = pattern.rstrip('*')
+        self._anchored_parent = (_compile_anchored(parent[:-1])
+                                 if self.anchored and parent != pattern and parent.endswith('/') else None)
+
+    def matches(self, filepath: str) -> bool:
+        """Whether the rule matches a path relative to its .syncignore"""
+        pattern = self.pattern
+
+        if self.anchored:
+            # The rule matches the path itself or one of its parent directories;
+            # a trailing slash restricts it to directories
+            candidates = _ancestors(filepath)
+            if self._dirglob is not None:
+                candidates = candidates[:-1]
+            return any(self._anchored(candidate) for candidate in candidates)
+
+        # Directory-specific pattern with **
+        if self._starglob and self._starglob(filepath):
+            return True
+
+        # Pattern with trailing slash (directory only)
+        dir_pattern = self._dirglob
+        if dir_pattern is not None and (filepath == dir_pattern or
+                                        filepath.startswith(f"{dir_pattern}/")):
+            return True
+
+        if dir_pattern is not None and f"/{dir_pattern}/" in filepath:
+            return True
+
+        # Standard file pattern
+        if self._glob(filepath) or self._glob(os.path.basename(filepath)):
+            return True
+
+        # Pattern might be for a subdirectory
+        if '/' in pattern and any(self._glob(subpath) for subpath in _suffixes(filepath)):
+            return True
+
+        # Directory patterns that should match all contents
+        if not pattern.endswith('/*') and not pattern.endswith('/**'):
+            if os.path.sep not in pattern and filepath.startswith(f"{pattern}/"):
+                return True
+            if any(self._glob(part) for part in filepath.split('/')):
+                return True
+
+        return False
+
+    def matches_dir(self, dirpath: str) -> bool:
+        """Whether the rule matches every path that could exist under dirpath"""
+        pattern = self.pattern
+        dirprefix = f"{dirpath}/"
+
+        if self.anchored:
+            # Matching the directory or a parent covers everything below it, and so
+            # does 'dir/*' or 'dir/**' for dir itself or a parent
+            candidates = _ancestors(dirpath)
+            if any(self._anchored(candidate) for candidate in candidates):
+                return True
+            return self._anchored_parent is not None and \
+                any(self._anchored_parent(candidate) for candidate in candidates)
+
+        if self._dirglob is not None and dirprefix.startswith(f"{self._dirglob}/"):
+            return True
+
+        if self._prefix is not None and self._prefix(dirprefix):
+            return True
+
+        if self._dirglob is not None and f"/{self._dirglob}/" in dirprefix:
+            return True
+
+        if self._prefix is not None:
+            if pattern.strip('*') == '':
+                return True
+            if '/' in pattern and any(self._prefix(subpath) for subpath in _suffixes(dirprefix)[:-1]):
+                return True
+
+        if not pattern.endswith('/*') and not pattern.endswith('/**'):
+            if os.path.sep not in pattern and dirprefix.startswith(f"{pattern}/"):
+                return True
+            if any(self._glob(part) for part in dirpath.split('/')):
+                return True
+
+        return False
+
 
 class GitignoreParser:
+    """
+    Gitignore-style matcher over nested .syncignore files.
+
+    Every directory may hold its own .syncignore whose patterns are relative to
+    that directory. Deeper files take precedence over their parents and, within
+    a file, later patterns win. A directory is excluded whole, and skipped by
+    the scanner, when a rule covers it and no '!' rule follows that rule in the
+    applicable files; after that, a deeper .syncignore cannot re-include
+    anything inside it.
+    """
+
     def __init__(self, ignore_file: str = ".syncignore"):
         self.ignore_file = ignore_file
-        self.patterns = self._load_patterns()
-        
-    def _load_patterns(self) -> List[Tuple[bool, str]]:
+        self.root = os.path.dirname(ignore_file)
+        self.ignore_name = os.path.basename(ignore_file)
+        self.reload()
+
+    def reload(self):
+        """Drop every cached rule set, e.g. after a .syncignore was edited"""
+        self.patterns = self._load_patterns(self.ignore_file)
+        # Compiled rules of each directory's .syncignore (None when it has none)
+        self._rules: Dict[str, Optional[List[IgnoreRule]]] = {
+            '': [IgnoreRule(is_include, pattern) for is_include, pattern in self.patterns] or None
+        }
+        # Per directory: (rule sets that apply to its files, whether it is excluded whole)
+        self._dirs: Dict[str, Tuple[tuple, bool]] = {}
+
+    def _load_patterns(self, ignore_file: str) -> List[Tuple[bool, str]]:
         """Load patterns as tuples of (is_include, pattern)"""
         patterns = []
-        if os.path.exists(self.ignore_file):
-            with open(self.ignore_file, 'r') as f:
+        if os.path.exists(ignore_file):
+            with open(ignore_file, 'r') as f:
                 for line in f:
                     line = line.strip()
                     if line and not line.startswith('#'):
                         is_include = line.startswith('!')
                         pattern = line[1:] if is_include else line
-                        
-                        # Remove leading slash if present (makes pattern relative to root)
-                        if pattern.startswith('/'):
-                            pattern = pattern[1:]
-                            
-                        # Add pattern to list
+
+                        # Add pattern to list; a leading slash is kept so the
+                        # rule stays anchored to this file's directory
                         patterns.append((is_include, pattern))
         return patterns
 
+    def _rules_for(self, dirpath: str) -> Optional[List[IgnoreRule]]:
+        """Compiled rules of the .syncignore in dirpath, loaded on first use"""
+        if dirpath not in self._rules:
+            ignore_file = os.path.join(self.root, dirpath, self.ignore_name)
+            self._rules[dirpath] = [IgnoreRule(is_include, pattern)
+                                    for is_include, pattern in self._load_patterns(ignore_file)] or None
+        return self._rules[dirpath]
+
+    def _dir_state(self, dirpath: str) -> Tuple[tuple, bool]:
+        """Return (applicable rule sets, excluded) for a directory, cached"""
+        state = self._dirs.get(dirpath)
+        if state is not None:
+            return state
+
+        if not dirpath:
+            rules = self._rules_for('')
+            state = ((('', rules),) if rules else (), False)
+        else:
+            chain, excluded = self._dir_state(dirpath.rpartition('/')[0])
+            if not excluded:
+                excluded = self._covers(chain, dirpath)
+            if not excluded:
+                rules = self._rules_for(dirpath)
+                if rules:
+                    chain = chain + ((dirpath, rules),)
+            state = (chain, excluded)
+
+        self._dirs[dirpath] = state
+        return state
+
+    @staticmethod
+    def _covers(chain: tuple, dirpath: str) -> bool:
+        """Whether the rule chain excludes everything under dirpath for certain"""
+        covered = False
+        for base, rules in chain:
+            relpath = dirpath[len(base) + 1:] if base else dirpath
+            for rule in rules:
+                if rule.is_include:
+                    # Any later include could bring something back
+                    covered = False
+                elif rule.matches_dir(relpath):
+                    covered = True
+        return covered
+
+    def should_prune_dir(self, dirpath: str) -> bool:
+        """Whether a whole directory is excluded and need not be read"""
+        return self._dir_state(dirpath.replace('\\', '/'))[1]
+
     def should_ignore(self, filepath: str) -> bool:
         """
         Determine if a file should be ignored.
         Returns True if the file should be ignored, False if it should be included.
         """
-        if not self.patterns:
-            return False
+        # Normalize path separators to forward slashes
+        filepath = filepath.replace('\\', '/')
+
+        chain, excluded = self._dir_state(filepath.rpartition('/')[0])
+        if excluded:
+            return True
 
-        # Default to not ignoring anything
+        # Default to not ignoring anything; deeper files override their parents
         should_exclude = False
+        for base, rules in chain:
+            relpath = filepath[len(base) + 1:] if base else filepath
+            for rule in rules:
+                if rule.matches(relpath):
+                    should_exclude = not rule.is_include
 
-        # Normalize path separators to forward slashes
-        filepath = filepath.replace('\\', '/')
-        
-        # Check all patterns in order
-        for is_include, pattern in self.patterns:
-            # Handle different pattern types
-            
-            # Case 1: Directory-specific pattern with **
-            if '**' in pattern:
-                # Replace ** with a wildcard that matches anything
-                regex_pattern = pattern.replace('**', '*')
-                if fnmatch.fnmatch(filepath, regex_pattern):
-                    should_exclude = not is_include
-                    continue
-            
-            # Case 2: Pattern with trailing slash (directory only)
-            if pattern.endswith('/'):
-                # For directories, check if the path starts with the pattern
-                dir_pattern = pattern[:-1]  # Remove trailing slash
-                
-                # More explicit check for files inside directory
-                if (filepath == dir_pattern or 
-                    filepath.startswith(f"{dir_pattern}/") or 
-                    f"/{dir_pattern}/" in filepath):
-                    should_exclude = not is_include
-                    continue
-            
-            # Case 3: Standard file pattern
-            if fnmatch.fnmatch(filepath, pattern) or fnmatch.fnmatch(os.path.basename(filepath), pattern):
-                should_exclude = not is_include
-                continue
-                
-            # Case 4: Pattern might be for a subdirectory
-            if '/' in pattern:
-                # Check if any part of the path matches the pattern
-                parts = filepath.split('/')
-                for i in range(len(parts)):
-                    subpath = '/'.join(parts[i:])
-                    if fnmatch.fnmatch(subpath, pattern):
-                        should_exclude = not is_include
-                        break
-            
-            # Case 5: Handle directory patterns that should match all contents
-            if not pattern.endswith('/*') and not pattern.endswith('/**'):
-                # If this pattern is a directory name
-                if os.path.sep not in pattern and filepath.startswith(f"{pattern}/"):
-                    should_exclude = not is_include
-                    continue
-                
-                # Check if this file is in a directory that matches the pattern
-                path_parts = filepath.split('/')
-                for i in range(len(path_parts)):
-                    if fnmatch.fnmatch(path_parts[i], pattern):
-                        should_exclude = not is_include
-                        break
-        
         return should_exclude
-    
+
     def debug_patterns(self) -> List[str]:
         """Return loaded patterns for debugging"""
-        return [f"{'Include' if is_include else 'Exclude'}: {pattern}" 
-                for is_include, pattern in self.patterns]
\ No newline at end of file
+        lines = []
+        for dirpath, rules in sorted(self._rules.items()):
+            for rule in rules or ():
+                prefix = f"{dirpath}/{self.ignore_name}: " if dirpath else ""
+                pattern = f"/{rule.pattern}" if rule.anchored else rule.pattern
+                lines.append(f"{prefix}{'Include' if rule.is_include else 'Exclude'}: {pattern}")
+        return lines
@@ -0,0 +1,74 @@
+import re
+import json
+import codecs
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array as its bytes arrive.
+
+    Only the element being decoded is buffered, so a listing whose documents
+    carry their full content never has to be held in memory at once.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+
+    def pieces():
+        for chunk in chunks:
+            yield utf8.decode(chunk), False
+        yield utf8.decode(b'', final=True), True
+
+    buffer = ''
+    started = False
+    # A failed decode is retried only once the buffer has doubled, which keeps
+    # the work linear when one element spans many chunks
+    retry_at = 0
+
+    for text, final in pieces():
+        buffer += text
+        if not final and len(buffer) < retry_at:
+            continue
+
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if not started:
+                if char != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if char == ']':
+                return
+            if char == ',':
+                pos += 1
+                continue
+
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                retry_at = 2 * (len(buffer) - pos)
+                break
+            # A number may decode from a prefix of itself ("1.5" out of "1.5e10"), so
+            # other scalars are only taken once the ',' or ']' after them has arrived
+            if not final and not isinstance(element, (dict, list, str)):
+                after = _WHITESPACE.match(buffer, end).end()
+                if after == len(buffer) or buffer[after] not in ',]':
+                    break
+
+            yield element
+            pos = end
+            retry_at = 0
+
+        buffer = buffer[pos:]
+
+    raise ValueError("Truncated JSON array")
@@ -0,0 +1,160 @@
+import sys
+import time
+import shutil
+import threading
+import collections
+from typing import Deque, Optional, TextIO, Tuple
+
+# Seconds of recent requests the current rates are computed over
+RATE_WINDOW = 5.0
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class ProgressMeter:
+    """
+    Counts operations, requests and bytes of a long sync and shows them on one line.
+
+    On a terminal the line is redrawn in place at most every refresh_interval
+    seconds; otherwise (logs, pipes, the daemon) a plain line is written every
+    log_interval seconds. The counters can be read at any time with snapshot(),
+    from any thread.
+    """
+
+    def __init__(self, total_ops: int, total_bytes: int = 0, stream: Optional[TextIO] = None,
+                 refresh_interval: float = 0.2, log_interval: float = 10.0):
+        self.total_ops = total_ops
+        self.total_bytes = total_bytes
+        self.stream = stream or sys.stdout
+        self.is_tty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.interval = refresh_interval if self.is_tty else log_interval
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self.started_at = time.monotonic()
+        self._recent: Deque[Tuple[float, int]] = collections.deque()
+        self._lock = threading.Lock()
+        self._last_render = 0.0
+        self._line_width = 0
+
+    def request(self, nbytes: int = 0):
+        """Count one API request carrying nbytes"""
+        with self._lock:
+            now = time.monotonic()
+            self.requests += 1
+            self.bytes_sent += nbytes
+            self._recent.append((now, nbytes))
+            while self._recent and self._recent[0][0] < now - RATE_WINDOW:
+                self._recent.popleft()
+        self._maybe_render()
+
+    def start(self):
+        """An operation (one file to push or delete) begins"""
+        with self._lock:
+            self.in_flight += 1
+        self._maybe_render()
+
+    def finish(self, failed: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            if failed:
+                self.failed += 1
+        self._maybe_render()
+
+    def log(self, message: str):
+        """Print a message above the progress line"""
+        with self._lock:
+            self._clear_line()
+            print(message, file=self.stream)
+            if self.is_tty:
+                # Redraw the line below the message on the next update
+                self._last_render = 0.0
+
+    def snapshot(self) -> dict:
+        """Current counters, rates over the last few seconds and the estimated time left"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.started_at
+            window = min(RATE_WINDOW, elapsed) or 1e-9
+            recent = [entry for entry in self._recent if entry[0] >= now - RATE_WINDOW]
+            requests_per_second = len(recent) / window
+            bytes_per_second = sum(nbytes for _, nbytes in recent) / window
+
+            # Estimate from bytes when they dominate, from the operation rate otherwise
+            eta = None
+            if self.completed and self.completed < self.total_ops:
+                eta = elapsed / self.completed * (self.total_ops - self.completed)
+            if self.total_bytes and bytes_per_second and self.bytes_sent < self.total_bytes:
+                eta = max(eta or 0.0, (self.total_bytes - self.bytes_sent) / bytes_per_second)
+
+            return {
+                'completed': self.completed,
+                'total': self.total_ops,
+                'failed': self.failed,
+                'in_flight': self.in_flight,
+                'requests': self.requests,
+                'bytes_sent': self.bytes_sent,
+                'total_bytes': self.total_bytes,
+                'elapsed': elapsed,
+                'requests_per_second': requests_per_second,
+                'bytes_per_second': bytes_per_second,
+                'eta': eta
+            }
+
+    def _format(self, snap: dict) -> str:
+        line = (f"{snap['completed']}/{snap['total']} done, "
+                f"{_format_bytes(snap['bytes_sent'])} sent, "
+                f"{snap['requests_per_second']:.1f} req/s, "
+                f"{snap['bytes_per_second'] / (1024 * 1024):.2f} MB/s, "
+                f"{snap['in_flight']} in flight")
+        if snap['failed']:
+            line += f", {snap['failed']} failed"
+        if snap['eta'] is not None:
+            line += f", ETA {_format_duration(snap['eta'])}"
+        return line
+
+    def _clear_line(self):
+        if self.is_tty and self._line_width:
+            self.stream.write('\r' + ' ' * self._line_width + '\r')
+            self._line_width = 0
+
+    def _maybe_render(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_render < self.interval:
+            return
+        line = self._format(self.snapshot())
+        with self._lock:
+            self._last_render = now
+            if self.is_tty:
+                width = shutil.get_terminal_size().columns - 1
+                line = line[:width]
+                self.stream.write('\r' + line.ljust(self._line_width))
+                self._line_width = len(line)
+            else:
+                self.stream.write(f"Progress: {line}\n")
+            self.stream.flush()
+
+    def close(self):
+        """Show the final counters and leave the line in place"""
+        self._maybe_render(force=True)
+        with self._lock:
+            if self.is_tty:
+                self.stream.write('\n')
+                self._line_width = 0
+            self.stream.flush()
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import threading
+import contextlib
+from typing import Optional
+
+# Bucket state is shared through a file locked with flock; where that isn't
+# available (Windows) the limit only holds within one process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class RateLimiter:
+    """
+    Token buckets for requests per second and bytes per second.
+
+    The bucket levels live in a small JSON file that every claude-sync process
+    on the host updates under an exclusive lock, so concurrent syncs share one
+    budget instead of each bursting into the server's throttling.
+    """
+
+    def __init__(self, state_file: str, requests_per_second: Optional[float] = None,
+                 bytes_per_second: Optional[float] = None, burst_seconds: float = 1.0):
+        self.state_file = state_file
+        self.requests_per_second = requests_per_second
+        self.bytes_per_second = bytes_per_second
+        # Buckets hold at most this many seconds' worth of tokens
+        self.burst_seconds = burst_seconds
+        self._lock = threading.Lock()
+        self._memory_state = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['RateLimiter']:
+        """Build the limiter from the 'rate_limit' section of the global config, if any"""
+        settings = config.get('rate_limit') or {}
+        requests_per_second = settings.get('requests_per_second')
+        bytes_per_second = settings.get('bytes_per_second')
+        if not requests_per_second and not bytes_per_second:
+            return None
+
+        # One budget per organization, since that is what the server throttles
+        state_file = settings.get('state_file') or os.path.expanduser(
+            f"~/.claude-sync.ratelimit-{config['organization_id']}.json")
+        return cls(state_file, requests_per_second, bytes_per_second,
+                   settings.get('burst_seconds', 1.0))
+
+    @contextlib.contextmanager
+    def _shared_state(self):
+        """Yield the bucket state dict, holding the cross-process lock; changes are saved"""
+        with self._lock:
+            if fcntl is None:
+                yield self._memory_state
+                return
+
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), 'r+') as f:
+                    try:
+                        state = json.loads(f.read() or '{}')
+                    except ValueError:
+                        # Corrupt or half-written state: start from full buckets
+                        state = {}
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+            finally:
+                os.close(fd)
+
+    def _refill(self, state: dict, key: str, rate: float, now: float) -> float:
+        capacity = rate * self.burst_seconds
+        tokens = state.get(key, capacity)
+        elapsed = max(0.0, now - state.get('updated', now))
+        return min(capacity, tokens + elapsed * rate)
+
+    def acquire(self, nbytes: int = 0):
+        """Block until one request carrying nbytes may be sent"""
+        while True:
+            with self._shared_state() as state:
+                now = time.time()
+                wait = 0.0
+                tokens = {}
+
+                for key, rate, needed in (('requests', self.requests_per_second, 1),
+                                          ('bytes', self.bytes_per_second, nbytes)):
+                    if not rate:
+                        continue
+                    tokens[key] = self._refill(state, key, rate, now)
+                    # A payload larger than the bucket goes out once the bucket
+                    # is full and leaves it in debt, so it can never starve
+                    needed = min(needed, rate * self.burst_seconds)
+                    wait = max(wait, (needed - tokens[key]) / rate)
+
+                for key, value in tokens.items():
+                    state[key] = value
+                state['updated'] = now
+
+                if wait <= 0:
+                    if 'requests' in tokens:
+                        state['requests'] -= 1
+                    if 'bytes' in tokens:
+                        state['bytes'] -= nbytes
+                    return
+
+            time.sleep(wait)